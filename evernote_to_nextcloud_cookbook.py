@@ -20,15 +20,660 @@ import re
 from datetime import datetime
 import argparse
 import zipfile
-import tempfile
-import shutil
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, FrozenSet, Iterable, Iterator
 import html
 import base64
 import hashlib
+import gzip
+import heapq
+import functools
+import io
+import itertools
 import requests
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib.parse import urljoin, urlparse
 import time
+import random
+import threading
+import multiprocessing
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _first_letter_alternation(words) -> str:
+    """Build a regex alternation with the words grouped by first letter, so each position tries one branch"""
+    by_letter: Dict[str, List[str]] = {}
+    for word in sorted(words):
+        by_letter.setdefault(word[0], []).append(re.escape(word[1:]))
+    return '|'.join(re.escape(letter) + '(?:' + '|'.join(rests) + ')' for letter, rests in by_letter.items())
+
+
+# Enhanced pattern matching for ingredients - more comprehensive patterns
+_INGREDIENT_PATTERNS = (
+    # CRITICAL FIX: Simple whole number + unit patterns (this was missing!)
+    r'^\s*\d+\s+(cups?|cup|tablespoons?|tbsp|tablespoon|teaspoons?|tsp|teaspoon)',  # "1 cup", "4 cups", "2 tablespoons"
+    r'^\s*\d+\s+(pounds?|lbs?|lb|ounces?|oz|ounce)',  # "1 pound", "12 ounces"
+    r'^\s*\d+\s+(grams?|g|kilograms?|kg)',  # "96 g", "1 kg"
+    r'^\s*\d+\s+(ml|milliliters?|liters?|l)',  # "235 ml", "1 liter"
+
+    # Specific complex patterns with parentheses
+    r'^\s*\d+\s*(lbs?|pounds?|lb)\s*\(\s*\d+g?\s*\)',  # "1 lb ( 453g)"
+    r'^\s*\d+\s+\d+/\d+\s*-\s*\d+\s*(cups?|cup)\s*\(\d+-\d+\s*ml\)',  # "1 1/3-2 cups (320-473 ml)"
+    r'^\s*\d+\s*(cups?|cup)\s*\(\d+\s*g\)',  # "4 cups (400 g)"
+    r'^\s*\d+\s*(teaspoons?|tsp)\s*\(\d+\s*g\)',  # "4 teaspoons (8 g)"
+    r'^\s*\d+\s*-\s*\d+\s*\(\d+-\d+\s*g\)\s*(tablespoons?|tbsp)',  # "4-7 (15-30 g) tablespoons"
+
+    # Decimal patterns
+    r'^\s*\d+\.\d+\s*(cups?|tablespoons?|tbsp|tablespoon|teaspoons?|tsp|teaspoon)',
+    r'^\s*\d+\.\d+\s*(pounds?|lbs?|lb|ounces?|oz|ounce)',
+    r'^\s*\d+\.\d+\s*(grams?|g|kilograms?|kg)',
+    r'^\s*\d+\.\d+\s*(ml|milliliters?|liters?|l)',
+
+    # Container/package patterns
+    r'^\s*\d+\s+(cans?|can|jars?|jar|bottles?|bottle|packages?|pkg|package)',
+    r'^\s*\d+\s+(cloves?|clove|heads?|head|bunches?|bunch)',
+    r'^\s*\d+\s+(slices?|slice|pieces?|piece)',
+
+    # Fraction patterns
+    r'^\s*\d+/\d+\s*(cups?|tablespoons?|tbsp|teaspoons?|tsp|pounds?|lbs?|ounces?|oz)',
+    r'^\s*\d+\s+\d+/\d+\s*(cups?|tablespoons?|tbsp|teaspoons?|tsp|pounds?|lbs?|ounces?|oz)',
+
+    # Unicode fractions
+    r'^\s*[¼½¾⅓⅔⅛⅜⅝⅞]\s*(cups?|tablespoons?|tbsp|teaspoons?|tsp|pounds?|lbs?|ounces?|oz)',
+
+    # NEW: Simple ingredient names without measurements (catch ingredients that don't have measurements)
+    r'^\s*[a-zA-Z][a-zA-Z\s,\-\(\)]*(?:tofu|oil|sauce|miso|chipotle|garlic|ginger|scallions?|pepper|salt|sesame|vinegar|sugar|honey|lime|lemon|soy|firm|extra|virgin|olive|vegetable|canola|peanut|rice|wine|white|red|black|ground|fresh|dried|minced|chopped|sliced)[a-zA-Z\s,\-\(\)]*$',
+
+    # Even more lenient: any line that contains common ingredient words but no measurements
+    r'.*(?:tofu|miso|chipotle|garlic|ginger|scallions?|green onions?|soy sauce|sesame oil|rice vinegar|sugar|honey|lime|lemon|oil|sauce|pepper|salt).*',
+
+    # Simple number + any word (catch-all for items like "2 eggs", "3 apples")
+    r'^\s*\d+\s+[a-zA-Z]+',  # "2 teaspoons", "12 ounces", etc.
+)
+
+# All ingredient patterns fused into one alternation so each line needs a single match
+_ALL_ING_RE = re.compile('|'.join(f'(?:{p})' for p in _INGREDIENT_PATTERNS), re.IGNORECASE)
+
+# Common measurement units
+_MEASUREMENTS = (
+    'cup', 'cups', 'tablespoon', 'tablespoons', 'tbsp', 'teaspoon', 'teaspoons', 'tsp',
+    'pound', 'pounds', 'lb', 'lbs', 'ounce', 'ounces', 'oz', 'gram', 'grams', 'g',
+    'kilogram', 'kg', 'liter', 'liters', 'ml', 'milliliter', 'quart', 'pint',
+    'gallon', 'inch', 'inches', 'can', 'cans', 'package', 'pkg', 'bottle',
+    'jar', 'box', 'bag', 'bunch', 'clove', 'cloves', 'head', 'slice', 'slices'
+)
+
+# Quantity at the start of the line followed later by any measurement unit
+_MEASURE_RE = re.compile(
+    r'^\s*(?:\d+|[¼½¾⅓⅔⅛⅜⅝⅞]).*?\b(?:' + '|'.join(re.escape(m) for m in _MEASUREMENTS) + r')\b'
+)
+
+# Instruction verbs that disqualify short "to taste" / "salt and pepper" lines
+_INSTRUCTION_STARTERS_EARLY = frozenset({
+    'uncover', 'stir', 'mix', 'add', 'heat', 'cook', 'remove', 'serve', 'drain', 'transfer', 'top'
+})
+
+# Lines starting with these action verbs are cooking instructions
+_INSTRUCTION_STARTERS = frozenset({
+    'heat', 'cook', 'bake', 'boil', 'simmer', 'saute', 'fry', 'grill',
+    'mix', 'stir', 'whisk', 'blend', 'combine', 'add', 'pour', 'place',
+    'remove', 'drain', 'rinse', 'wash', 'chop', 'dice', 'slice', 'cut',
+    'preheat', 'serve', 'garnish', 'season', 'taste', 'adjust',
+    'make', 'prepare', 'get', 'take', 'put', 'set', 'let', 'allow',
+    'bring', 'reduce', 'increase', 'cover', 'uncover', 'flip', 'turn',
+    'grate', 'melt', 'dissolve', 'spread', 'brush', 'spray', 'oil',
+    'grease', 'line', 'transfer', 'arrange', 'top', 'fill', 'stuff'
+})
+
+# Section headers that are never ingredients
+_SECTION_HEADERS = (
+    'ingredients', 'directions', 'instructions', 'method', 'preparation',
+    'for the', 'herb blend', 'everything else', 'sauce', 'topping',
+    'marinade', 'dressing', 'garnish', 'notes', 'variations'
+)
+
+# Phrases that mark procedural text rather than ingredients
+_PROCEDURAL_PHRASES = (
+    'using', 'while', 'until', 'when', 'then', 'next', 'after',
+    'before', 'during', 'meanwhile', 'alternately', 'alternatively',
+    'if you', 'you can', 'this will', 'this is', 'repeat', 'continue',
+    'coming to', 'works pretty', 'is easier', 'my favorite', 'i find',
+    'i like', 'and stir', 'stir them', 'into the sauce'
+)
+
+# More than one of these in a line means it is likely an instruction
+_INSTRUCTION_WORDS = (
+    'until', 'then', 'and stir', 'and mix', 'and add', 'and pour',
+    'according to', 'as needed', 'or more', 'if needed', 'coming to',
+    'works pretty', 'is easier', 'my favorite', 'i find', 'i like'
+)
+
+# Phrases that identify substitution notes
+_SUBSTITUTION_INDICATORS = (
+    'you can replace', 'can replace', 'replace', 'substitute',
+    'try replacing', 'instead of', 'alternative', 'or use',
+    'can substitute', 'can use', 'use instead'
+)
+
+# Key food words used to pair substitution notes with ingredients
+_FOOD_WORDS = frozenset({
+    'pecans', 'pecan', 'parsley', 'sage', 'herbs', 'nuts', 'cheese',
+    'flour', 'oil', 'butter', 'onion', 'garlic', 'milk', 'cream',
+    'mushrooms', 'mushroom', 'chicken', 'beef', 'pork', 'fish'
+})
+
+# Cooking keywords that indicate a line is an instruction
+_INSTRUCTION_KEYWORDS = (
+    'cook', 'bake', 'mix', 'add', 'heat', 'stir', 'pour', 'place',
+    'remove', 'serve', 'prepare', 'combine', 'season', 'boil',
+    'simmer', 'fry', 'chop', 'slice', 'dice', 'mince', 'whisk',
+    'blend', 'fold', 'beat', 'knead', 'roll', 'spread', 'brush',
+    'drizzle', 'sprinkle', 'garnish', 'chill', 'freeze', 'thaw',
+    'create', 'preheat', 'until', 'then', 'next', 'meanwhile'
+)
+_INSTRUCTION_KW_RE = re.compile(r'\b(?:' + _first_letter_alternation(_INSTRUCTION_KEYWORDS) + r')\b')
+
+# Verbs that keep an instruction from being moved to the ingredients
+_COOKING_VERBS = (
+    'make', 'melt', 'mix', 'stir', 'cook', 'heat', 'drain', 'transfer',
+    'add in', 'dump', 'brown', 'mixing in', 'stirring', 'top with',
+    'melting', 'breadcrumb', 'topping', 'constantly', 'drain and',
+    'noodles', 'transfer to', 'plate'
+)
+_COOKING_VERBS_RE = re.compile('|'.join(map(re.escape, _COOKING_VERBS)))
+
+# Patterns that indicate an instruction line is actually ingredient information
+_INGREDIENT_INDICATORS = (
+    # Very specific pattern for the exact line we want to catch
+    r'optional\s+additional\s+seasonings?\s+to\s+taste.*i\s+usually\s+add',
+    # More flexible pattern for optional seasonings
+    r'^optional\s+additional\s+seasonings?\s+to\s+taste',
+    # Standalone "to taste" without cooking verbs
+    r'^\s*to\s+taste\s*[-:]?\s*(?:salt|pepper|seasoning)',
+    # Simple ingredient lists starting with "optional"
+    r'^optional\s*[-:]?\s*[a-z\s,&]+\s+to\s+taste\s*$',
+)
+# One group per indicator, so lastindex tells which one matched
+_INGREDIENT_INDICATOR_RE = re.compile('|'.join(f'({p})' for p in _INGREDIENT_INDICATORS))
+
+
+# Leading list markers removed by _clean_ingredient_line; at most one of each kind,
+# bullets and dashes first, then Unicode bullets, then checkmarks and checkboxes
+_LEADING_MARKERS_RE = re.compile(
+    r'^(?:\s*[•\-\*\+\>\◦\▪\▫\○\●\□\■\➤\→\⁃]\s*)?'
+    r'(?:\s*[‣‧⁌⁍]\s*)?'
+    r'(?:\s*[☐✓✗□✔✘]\s*)?'
+)
+_NUMBER_MARKER_RE = re.compile(r'^\d+[\.\)\]]\s*')
+_LETTER_MARKER_RE = re.compile(r'^[a-zA-Z][\.\)]\s*')
+
+# Line classifier patterns
+_TO_TASTE_RE = re.compile(r'\bto\s+taste\b')
+_TO_TASTE_LITERALS = ('taste',)
+_SALT_AND_PEPPER_RE = re.compile(r'\bsalt\s+and\s+pepper\b')
+_SALT_AND_PEPPER_LITERALS = ('pepper',)
+_NUMBERED_STEP_RE = re.compile(r'^\d+[\.\)\-]\s')
+_LEADING_FRACTION_RE = re.compile(r'^\s*\d+/\d+')
+_LEADING_NUMBER_RE = re.compile(r'^\s*\d+')
+_SERVING_INFO_RE = re.compile(r'\b(serves?|servings?|yield|makes?)\s+\d+\b')
+_SERVING_INFO_LITERALS = ('serv', 'yield', 'make')
+_TIME_LABEL_RE = re.compile(r'\b(prep|cook|total)\s+time\b')
+_TIME_LABEL_LITERALS = ('time',)
+_IMAGE_RE = re.compile(r'\[IMAGE_(\d+)\]')
+_INGREDIENT_HEADER_RE = re.compile(r'\b(ingredient|材料)\b')
+_INGREDIENT_HEADER_LITERALS = ('ingredient', '材料')
+_INSTRUCTION_HEADER_RE = re.compile(r'\b(instruction|direction|method|step|作り方|手順)\b')
+_INSTRUCTION_HEADER_LITERALS = ('instruction', 'direction', 'method', 'step', '作り方', '手順')
+_SECTION_WORD_RE = re.compile(r'\b(ingredient|instruction|direction|method|step)\b')
+_SECTION_WORD_LITERALS = ('ingredient', 'instruction', 'direction', 'method', 'step')
+_INSTRUCTION_BULLET_RE = re.compile(r'^[•\-\*☐✓]\s*')
+_NUM_PREFIX_RE = re.compile(r'^\d+[\.\)]\s*')
+_WS_RE = re.compile(r'\s+')
+
+# Lines inside an ingredient section are accepted unless they read like a step
+_SECTION_CONTEXT_VERBS = ('heat', 'cook', 'bake', 'mix', 'stir', 'add', 'pour', 'remove')
+_SECTION_CONTEXT_STARTERS = ('step', 'then', 'next', 'meanwhile', 'after', 'before', 'until')
+
+# Exports with fewer notes than this are extracted in this process, since starting the worker
+# processes would take longer than extracting a handful of notes
+_PARALLEL_MIN_NOTES = 4
+# Recipe pages are downloaded in background threads; requests to one host stay spaced out.
+# Each host gets a token bucket, shared by page and image requests: a short burst, then one per interval.
+_FETCH_WORKERS = 16
+_HOST_FETCH_INTERVAL = 1.0
+_HOST_FETCH_BURST = 3
+# Query parameters kept by URL cleaning, matched as substrings of the parameter name
+_ESSENTIAL_URL_PARAMS = ('id', 'recipe', 'post', 'p', 'page')
+# Sites whose pages go straight to recipe extraction when fetched leniently
+_LENIENT_MAJOR_SITES = ('seriouseats.com', 'nytimes.com', 'foodnetwork.com', 'allrecipes.com')
+# Browser-like headers only offer brotli when it is installed, urllib3 cannot decode it otherwise
+_BROWSER_ACCEPT_ENCODING = ACCEPT_ENCODING.replace(',', ', ')
+# Responses no other headers or retries will change, so the remaining strategies are skipped
+_TERMINAL_HTTP_STATUSES = (401, 404, 410, 451)
+# Responses from a host that is rate limiting or overloaded, waited out before the next strategy
+_BACKOFF_STATUSES = (429, 503)
+# Longest wait between strategies when a host signals it is overloaded or rate limiting, and the
+# most one URL may wait in total; the host's lock is held meanwhile, so its other pages wait too
+_MAX_BACKOFF = 32.0
+_MAX_URL_BACKOFF = 60.0
+# Note bodies whose picked source URL is remembered for the rest of a run
+_SOURCE_URL_CACHE_SIZE = 2048
+
+# JSON-LD script blocks in fetched pages and the cleanup applied before parsing them
+_JSON_LD_SCRIPT_RE = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+                                re.DOTALL | re.IGNORECASE)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_JS_LINE_COMMENT_RE = re.compile(r'//.*?\n')
+_JS_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_JSON_LEADING_COMMA_RE = re.compile(r'\n\s*,')
+_JSON_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_JSON_MISSING_COMMA_RE = re.compile(r'([}\]"])\s*\n\s*"')
+
+# Recipe containers tried in order when a page has no usable JSON-LD, structured data first.
+# Each pattern comes with a lowercase marker it cannot match without, so pages lacking it skip the scan.
+_HTML_CONTENT_SELECTORS = tuple((marker, re.compile(selector, re.DOTALL | re.IGNORECASE)) for marker, selector in (
+    # PRIORITY 1: Look for structured data with microdata - this is most likely where the recipe is
+    ('itemtype', r'<div[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('itemtype', r'<section[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</section>'),
+    ('itemtype', r'<article[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</article>'),
+    ('itemscope', r'<div[^>]*itemscope[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</div>'),
+
+    # PRIORITY 2: SeriousEats specific class patterns - look for recipe content areas
+    ('recipe-summary', r'<div[^>]*class=["\'][^"\']*recipe-summary[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('recipe-procedure', r'<div[^>]*class=["\'][^"\']*recipe-procedure[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('recipe-ingredients', r'<div[^>]*class=["\'][^"\']*recipe-ingredients[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('recipe', r'<section[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</section>'),
+    ('recipe', r'<article[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</article>'),
+
+    # PRIORITY 3: More specific content containers
+    ('entry-content', r'<div[^>]*class=["\'][^"\']*entry-content[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('post-content', r'<div[^>]*class=["\'][^"\']*post-content[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('recipe-content', r'<div[^>]*class=["\'][^"\']*recipe-content[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('<main', r'<main[^>]*id=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</main>'),
+
+    # PRIORITY 4: Generic recipe patterns
+    ('recipe', r'<div[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('recipe', r'<article[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</article>'),
+    ('recipe', r'<section[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</section>'),
+
+    # PRIORITY 5: Broader content areas (these might pick up navigation, so try them last)
+    ('<main', r'<main[^>]*>(.*?)</main>'),
+    ('<article', r'<article[^>]*>(.*?)</article>'),
+    ('content', r'<div[^>]*id=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('main', r'<div[^>]*id=["\'][^"\']*main[^"\']*["\'][^>]*>(.*?)</div>'),
+    ('content', r'<div[^>]*class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>'),
+))
+_HTML_CLASS_ATTR_RE = re.compile(r'class=["\']([^"\']*)["\']', re.IGNORECASE)
+_HTML_ID_ATTR_RE = re.compile(r'id=["\']([^"\']*)["\']', re.IGNORECASE)
+
+# Recipe directory names keep word characters, spaces and dashes, with whitespace runs as underscores
+_UNSAFE_TITLE_CHARS_RE = re.compile(r'[^\w\s-]')
+_TITLE_WS_RE = re.compile(r'\s+')
+
+# Keywords every imported recipe is tagged with unless the tags are overridden
+_BASE_KEYWORDS = ("imported", "evernote")
+
+# Image formats that are stored in the export zip without deflating
+_COMPRESSED_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+
+def _host_unreachable(error: requests.exceptions.ConnectionError) -> bool:
+    """Check whether a request failed before any connection to the host was made"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _retry_after_seconds(response: Optional[requests.Response]) -> Optional[float]:
+    """Seconds a Retry-After header asks for, given either as a delay or as an HTTP date"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _json_ld_blocks(html_content: str) -> Tuple[str, ...]:
+    """Find the JSON-LD script blocks of a page once for all the extractors that look at it"""
+    return tuple(_JSON_LD_SCRIPT_RE.findall(html_content))
+
+
+def _is_recipe_node(node: dict) -> bool:
+    """Check whether a JSON-LD object is typed as a Recipe, alone or among other types"""
+    node_type = node.get('@type')
+    return node_type == 'Recipe' or (isinstance(node_type, list) and 'Recipe' in node_type)
+
+
+@functools.lru_cache(maxsize=1024)
+def _clean_recipe_url(url: str) -> str:
+    """Drop the fragment and all but the essential query parameters, once per distinct URL"""
+    if not url:
+        return url
+    
+    # Remove fragment (anchor)
+    url = url.partition('#')[0]
+    
+    # Remove common tracking and unnecessary parameters
+    base_url, has_query, params = url.partition('?')
+    if has_query:
+        keep_params = [param for param in params.split('&')
+                       if '=' in param and any(essential in param.partition('=')[0].lower()
+                                               for essential in _ESSENTIAL_URL_PARAMS)]
+        url = base_url + '?' + '&'.join(keep_params) if keep_params else base_url
+    
+    return url
+
+
+def _default_cache_dir() -> Path:
+    """Location of the fetched page cache, following the XDG base directory convention"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'evernote_to_nextcloud_cookbook'
+
+# Words in titles and URLs (runs of letters and digits)
+_WORD_TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Source URL scoring
+_RECIPE_URL_KEYWORDS = (
+    'recipe', 'food', 'cooking', 'kitchen', 'chef', 'cuisine', 'dish',
+    'allrecipes', 'foodnetwork', 'epicurious', 'bonappetit', 'seriouseats',
+    'tasteofhome', 'delish', 'food52', 'yummly', 'budget', 'meal',
+    'ingredient', 'bake', 'cook', 'serious', 'eats', 'blog', 'soup',
+    'midwest', 'foodie', 'vegan', 'lentil', 'tortilla'
+)
+_UNWANTED_URL_PARTS = (
+    '/print', '/comment', '/respond', '/feed', '/rss', '/trackback',
+    '/amp', '/mobile', 'facebook.com', 'twitter.com', 'instagram.com',
+    'pinterest.com', 'linkedin.com', 'youtube.com', 'youtu.be'
+)
+_RECIPE_SITES = (
+    'allrecipes.com', 'foodnetwork.com', 'epicurious.com', 'bonappetit.com',
+    'seriouseats.com', 'food52.com', 'tasteofhome.com'
+)
+_FOOD_BLOG_MARKERS = ('foodie', 'blog', 'kitchen', 'recipe')
+_RECIPE_PATH_INDICATORS = (
+    'soup', 'salad', 'chicken', 'beef', 'pasta', 'bread', 'cake',
+    'cookie', 'vegan', 'vegetarian', 'healthy', 'easy', 'quick'
+)
+_TRACKING_PARAMS = ('utm_', 'ref=', 'src=')
+
+# URL, page, serving and time lines skipped by the extractors; the named group says why
+_SKIP_LINE_RE = re.compile(
+    r'(?P<url>http|www\.|\.com|\.org)'
+    r'|\b(?:(?P<page>page\s+\d+\b|p\.\s*\d+\b)'
+    r'|(?P<serving>(?:serves?|servings?|yield|makes?)\s+\d+\b)'
+    r'|(?P<time>(?:prep|cook|total)\s+time\b|\d+\s+(?:min|minutes|hrs?|hours?)\b))'
+)
+_SKIP_REASONS = {'url': "URL", 'page': "page reference", 'serving': "serving info", 'time': "time info"}
+
+# Instructions keep serving info and times inside steps, only standalone time labels are skipped
+_INSTRUCTION_SKIP_RE = re.compile(
+    r'(?P<url>http|www\.|\.com|\.org)'
+    r'|\b(?:(?P<page>page\s+\d+\b|p\.\s*\d+\b)'
+    r'|(?P<time>(?:prep|cook|total)\s+time\b))'
+)
+_INSTRUCTION_SKIP_REASONS = {'url': "contains URL", 'page': "contains page reference",
+                             'time': "contains standalone time info"}
+
+# ENML to plain text conversion; tags sharing a replacement are removed in one pass
+_ENML_DROP_RE = re.compile(r'<\?xml[^>]*\?>|<!DOCTYPE[^>]*>|<en-note[^>]*>|</en-note>|</div>')
+_EN_MEDIA_RE = re.compile(r'<en-media[^>]*hash="(?P<hash>[^"]*)"[^>]*/?>')
+_EN_TODO_CHECKED_RE = re.compile(r'<en-todo[^>]*checked="true"[^>]*>')
+_EN_TODO_RE = re.compile(r'<en-todo[^>]*>')
+_BLOCK_TAG_RE = re.compile(r'<(?:br|div)[^>]*>')
+_ANY_TAG_RE = re.compile(r'<[^>]+>')
+_MULTI_NEWLINE_RE = re.compile(r'\n+')
+_INLINE_WS_RE = re.compile(r'[ \t]+')
+_LINE_TRIM_RE = re.compile(r'^\s+|\s+$', re.MULTILINE)
+
+# Web page HTML to plain text conversion, with the same pass structure as ENML
+_SCRIPT_STYLE_RE = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_HTML_BLOCK_TAG_RE = re.compile(r'<br[^>]*>|<p[^>]*>|</p>|<div[^>]*>|</div>|</h[1-6]>', re.IGNORECASE)
+_HTML_LIST_ITEM_RE = re.compile(r'<li[^>]*>', re.IGNORECASE)
+_HTML_LIST_ITEM_CLOSE_RE = re.compile(r'</li>', re.IGNORECASE)
+_HTML_HEADING_RE = re.compile(r'<h[1-6][^>]*>', re.IGNORECASE)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+# Text prefixes are converted from growing slices of the page, with enough spare text that
+# the cut cannot affect the characters that are kept
+_TEXT_PREFIX_CHUNK = 64 * 1024
+_TEXT_PREFIX_MARGIN = 1000
+
+# Recipe section headings and measurements that make page text look like a recipe
+_RECIPE_SECTION_KEYWORD_RE = re.compile(
+    r'(?:ingredients?|directions?|instructions?|method|preparation):?\s*\n', re.IGNORECASE
+)
+_TEXT_MEASUREMENT_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\d+\s*(cups?|tablespoons?|teaspoons?|pounds?|ounces?)',
+    r'\d+/\d+\s*(cups?|tablespoons?|teaspoons?)',
+    r'[¼½¾⅓⅔⅛⅜⅝⅞]\s*(cups?|tablespoons?|teaspoons?)',
+))
+_PAGE_MEASUREMENT_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\d+\s*(cups?|tablespoons?|teaspoons?|pounds?|ounces?|grams?)',
+    r'\d+/\d+\s*(cups?|tablespoons?|teaspoons?)',
+    r'[¼½¾⅓⅔⅛⅜⅝⅞]\s*(cups?|tablespoons?|teaspoons?)',
+    r'\d+\s*(tbsp|tsp|oz|lb|g|kg|ml|l)\b',
+))
+# Cooking verbs counted as whole words in fetched page text
+_PAGE_COOKING_ACTIONS_RE = re.compile(r'\b(?:' + '|'.join((
+    'bake', 'cook', 'heat', 'mix', 'stir', 'add', 'pour', 'combine',
+    'blend', 'whisk', 'fold', 'beat', 'chop', 'dice', 'slice',
+    'preheat', 'serve', 'garnish', 'season', 'simmer', 'boil',
+)) + r')\b')
+_NON_WORD_CHARS_RE = re.compile(r'[^\w\s]')
+_SUBSTITUTION_PREFIX_RE = re.compile(r'^(you can |can |try )', re.IGNORECASE)
+
+# ISO 8601 duration parts
+_DURATION_HOURS_RE = re.compile(r'(\d+)H')
+_DURATION_MINUTES_RE = re.compile(r'(\d+)M')
+
+# Source URLs given explicitly in note content, then any URL in the text
+_EXPLICIT_SOURCE_URL_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'<source-url>\s*(https?://[^<>"\']+)\s*</source-url>',  # <source-url>...</source-url>
+    r'--en-clipped-source-url:\s*(https?://[^\s<>"\']+)',    # Evernote clipped URLs
+))
+_CONTENT_URL_RES = tuple(re.compile(pattern) for pattern in (
+    # Standard URL pattern - stop at whitespace, quotes, or sentence-ending punctuation
+    r'https?://[^\s<>"\']+',
+    # More specific pattern for common recipe sites
+    r'https?://(?:www\.)?[\w\-]+\.com[^\s<>"\']*',
+    # SeriousEats specific
+    r'https?://(?:www\.)?seriouseats\.com[^\s<>"\']*',
+))
+
+# Candidate source URLs that are never recipe pages, fused into one pattern
+_INVALID_SOURCE_URL_RE = re.compile('|'.join((
+    r'\.dtd',  # XML DTD files
+    r'\.xsd',  # XML Schema files
+    r'\.xml',  # Generic XML files
+    r'evernote\.com',  # Evernote URLs
+    r'xml\..*\.com',  # XML-related domains
+    r'xmlns\.',  # XML namespace URLs
+    r'w3\.org',  # W3C specification URLs
+    r'example\.com',  # Example/placeholder URLs
+    r'localhost',  # Local URLs
+    r'127\.0\.0\.1',  # Local IP
+    r'\.css',  # CSS files
+    r'\.js',  # JavaScript files
+    r'\.png',  # Image files
+    r'\.jpg',  # Image files
+    r'\.gif',  # Image files
+    r'facebook\.com',  # Social media
+    r'twitter\.com',  # Social media
+    r'instagram\.com',  # Social media
+    r'pinterest\.com',  # Social media
+    r'linkedin\.com',  # Social media
+    r'youtube\.com',  # Video sharing
+    r'youtu\.be',  # Video sharing short links
+    r'api\.whatsapp\.com',  # WhatsApp sharing URLs
+    r'wa\.me',  # WhatsApp short links
+    r't\.co',  # Twitter short links
+    r'bit\.ly',  # Bitly short links
+    r'tinyurl\.com',  # TinyURL short links
+    r'mailto:',  # Email links
+)))
+# Query parameters that mark a URL as a sharing link rather than a recipe page
+_SHARING_URL_PARAMS = ('text=', 'url=', 'smid=', 'utm_source=', 'utm_medium=')
+
+# Image URL size markers removed or raised to get a larger image
+_IMAGE_DIMENSIONS_SUFFIX_RE = re.compile(r'-\d+x\d+(\.[a-zA-Z]+)$')
+_IMAGE_SIZE_INDICATOR_RES = tuple(re.compile(re.escape(indicator) + r'(\.[a-zA-Z]+)$') for indicator in (
+    '-thumb', '-thumbnail', '-small', '-medium', '-preview',
+    '-150x150', '-300x300', '-400x400', '-150', '-300', '-400',
+    '_thumb', '_thumbnail', '_small', '_medium', '_preview',
+    '_150x150', '_300x300', '_400x400', '_150', '_300', '_400'
+))
+_CLOUDINARY_SIZE_RE = re.compile(r'/w_\d+,h_\d+/')
+_CLOUDINARY_SCALE_RE = re.compile(r'/c_scale,w_\d+/')
+_SQUARESPACE_FORMAT_RE = re.compile(r'\?format=\d+w')
+
+
+def _prefiltered_search(pattern: re.Pattern, literals: Tuple[str, ...], text: str) -> bool:
+    """Search text only if it contains one of the literals every match of pattern must include"""
+    for literal in literals:
+        if literal in text:
+            return pattern.search(text) is not None
+    return False
+
+
+def _is_image_placeholder(line: str) -> bool:
+    """Check for a leading [IMAGE_n] placeholder, only entering the regex when the prefix matches"""
+    return line.startswith('[IMAGE_') and _IMAGE_RE.match(line) is not None
+
+
+def _safe_title(title: str) -> str:
+    """Turn a recipe title into a directory name"""
+    return _TITLE_WS_RE.sub('_', _UNSAFE_TITLE_CHARS_RE.sub('', title).strip())
+
+
+def _replace_enml_tags(content: str, replace_media=None) -> str:
+    """Rewrite every ENML tag, en-media tags go through replace_media when given"""
+    # Constant replacements stay in C; only the rare media and checkbox passes are guarded
+    content = _ENML_DROP_RE.sub('', content)
+    if replace_media and '<en-media' in content:
+        content = _EN_MEDIA_RE.sub(replace_media, content)
+    if '<en-todo' in content:
+        content = _EN_TODO_CHECKED_RE.sub('✓ ', content)
+        content = _EN_TODO_RE.sub('☐ ', content)
+    content = _BLOCK_TAG_RE.sub('\n', content)
+    return _ANY_TAG_RE.sub('\n', content)
+
+
+def _clean_ingredient_line(line: str) -> str:
+    """Clean up an ingredient line"""
+    # Remove bullet points, list markers, checkmarks and checkboxes
+    line = line[_LEADING_MARKERS_RE.match(line).end():]
+    # Remove leading numbers with periods/parentheses/brackets
+    line = _NUMBER_MARKER_RE.sub('', line)
+    # Remove leading letters with periods/parentheses
+    line = _LETTER_MARKER_RE.sub('', line)
+    return line.strip()
+
+
+# Both extractors and the description check classify the same lines of a note
+@functools.lru_cache(maxsize=4096)
+def _is_ingredient_line(line: str) -> bool:
+    """Check if line looks like an ingredient with improved filtering"""
+    if not line or len(line.strip()) < 3:
+        return False
+
+    # Clean the line first to remove bullet points and other formatting
+    clean_line = _clean_ingredient_line(line)
+    if not clean_line or len(clean_line.strip()) < 3:
+        return False
+
+    line_lower = clean_line.lower()
+
+    # EARLY CHECK: Special case for "to taste" and "salt and pepper" patterns - these are usually ingredients
+    # But ONLY if they don't start with instruction verbs AND are short standalone lines
+    first_word = line_lower.split(None, 1)[0] if line_lower else ""
+
+    if (_prefiltered_search(_TO_TASTE_RE, _TO_TASTE_LITERALS, line_lower) or
+            _prefiltered_search(_SALT_AND_PEPPER_RE, _SALT_AND_PEPPER_LITERALS, line_lower)):
+        # Only accept as ingredient if it's a short line that doesn't start with instruction verbs
+        if first_word not in _INSTRUCTION_STARTERS_EARLY and len(clean_line) < 50:
+            return True
+
+    # STEP 1: Reject lines that are clearly cooking instructions (start with action verbs)
+    # Check if line starts with an instruction verb (use cleaned line)
+    if first_word in _INSTRUCTION_STARTERS:
+        return False
+
+    # STEP 2: Reject numbered instructions (1., 2., Step 1, etc.) - but NOT ingredient quantities
+    # Only reject if number is followed by period/parenthesis/dash AND space (like "1. Mix" or "1) Heat" or "1 - Stir")
+    # NOT if it's followed by a measurement unit (like "1 cup" or "12 ounces")
+    if _NUMBERED_STEP_RE.match(clean_line) or line_lower.startswith('step'):
+        return False
+
+    # STEP 3: Reject section headers
+    if line_lower.startswith(_SECTION_HEADERS):
+        return False
+
+    # STEP 4: Reject lines that are clearly procedural text
+    # Check for procedural phrases but be more careful about "to taste"
+    if any(phrase in line_lower for phrase in _PROCEDURAL_PHRASES):
+        return False
+
+    # STEP 5: Reject very long lines (likely instructions)
+    if len(line) > 200:
+        return False
+
+    # STEP 6: Look for positive ingredient indicators
+    # Check enhanced patterns first (use cleaned line)
+    if _ALL_ING_RE.match(clean_line):
+        return True
+
+    # Check if line contains measurements (strong indicator of ingredient)
+    has_measurement = _MEASURE_RE.search(line_lower)
+
+    # Check for fraction patterns (1/2, 3/4, etc.) - must be at start of line
+    has_fraction = _LEADING_FRACTION_RE.match(line)
+
+    # Check for number at start (quantity indicator) - use cleaned line
+    starts_with_number = _LEADING_NUMBER_RE.match(clean_line)
+
+    # Must have at least one positive indicator
+    if not (has_measurement or has_fraction or starts_with_number):
+        return False
+
+    # STEP 8: Additional checks for common ingredient patterns
+    # Reject if it contains too many instruction-like words
+    instruction_word_count = sum(1 for word in _INSTRUCTION_WORDS if word in line_lower)
+    if instruction_word_count > 1:  # More than 1 instruction word = likely instruction
+        return False
+
+    return True
+
+
+def _looks_like_instruction(line: str) -> bool:
+    """Check if a line looks like a cooking instruction (more strict than is_instruction_line)"""
+    # Must be longer than typical ingredients (checked first so short lines skip the regex work)
+    if len(line) < 20:
+        return False
+
+    line_lower = line.lower()
+
+    # Exclude serving/yield info
+    if _prefiltered_search(_SERVING_INFO_RE, _SERVING_INFO_LITERALS, line_lower):
+        return False
+
+    # Exclude time information (but not cooking instructions that mention time)
+    # Only reject standalone time references like "Prep time: 15 minutes" or "Cook time: 30 min"
+    if _prefiltered_search(_TIME_LABEL_RE, _TIME_LABEL_LITERALS, line_lower):
+        return False
+
+    # Use word boundaries to match complete words only
+    has_instruction_keyword = bool(_INSTRUCTION_KW_RE.search(line_lower))
+
+    return has_instruction_keyword
 
 
 class EvernoteToNextcloudConverter:
@@ -36,14 +681,13 @@ class EvernoteToNextcloudConverter:
         additional_tags: Optional[List[str]] = None, 
         override_tags: Optional[List[str]] = None,
         additional_categories: Optional[List[str]] = None,
-        override_categories: Optional[List[str]] = None):
+        override_categories: Optional[List[str]] = None,
+        jobs: Optional[int] = None):
         self.input_path = Path(input_path)
         self.output_file = Path(output_file)
         if not self.output_file.suffix:
             self.output_file = self.output_file.with_suffix('.zip')
         
-        # Create temporary directory
-        self.temp_dir = Path(tempfile.mkdtemp())
         self.recipe_counter = 0
         self.debug = debug
         self.enable_web_fetch = True  # Enabled by default, try curl-like approach first
@@ -51,6 +695,46 @@ class EvernoteToNextcloudConverter:
         self.override_tags = override_tags
         self.additional_categories = additional_categories or []
         self.override_categories = override_categories
+        self.jobs = jobs or os.cpu_count() or 1  # Worker processes for recipe extraction
+        # Per-host fetch spacing, shared by the fetch threads
+        self._host_buckets: Dict[str, Tuple[float, float]] = {}
+        # Fetched pages are kept on disk so re-running a conversion does not download them again
+        self.cache_dir: Optional[Path] = _default_cache_dir()
+        # Fetch strategy that last worked for each host, tried first for its other URLs
+        self._host_strategies: Dict[str, str] = {}
+        self._init_process_state()
+
+    def _init_process_state(self):
+        """Set up the export zip, fetch locks, session and per-run caches, which each process keeps to itself"""
+        # Recipes are written straight into the export zip, opened when the first one is ready
+        self._export_zip: Optional[zipfile.ZipFile] = None
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._host_locks_guard = threading.Lock()
+        # Pages fetched in this run by cleaned URL, '' when no strategy could fetch it, so notes
+        # sharing a page do not download it again even when the disk cache is disabled
+        self._fetched_pages: Dict[str, str] = {}
+        # Source URL picked from each note body and title, least recently used first; notes duplicated
+        # across the exports of one run are only scored once, the cache is not kept between runs.
+        # Bodies are keyed by a digest so the cache does not keep them alive.
+        self._content_source_urls: 'OrderedDict[Tuple[bytes, str], str]' = OrderedDict()
+        self._content_source_urls_lock = threading.Lock()
+        # One session for page and image downloads so connections to a host are kept alive and reused
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=50)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __getstate__(self):
+        """Leave the fetch locks, session and per-run caches behind when the converter is sent to extraction workers"""
+        state = self.__dict__.copy()
+        del state['_host_locks'], state['_host_locks_guard'], state['_export_zip'], state['session']
+        del state['_content_source_urls'], state['_content_source_urls_lock'], state['_fetched_pages']
+        return state
+
+    def __setstate__(self, state):
+        """Give a converter received by an extraction worker fresh, empty copies of what was left behind"""
+        self.__dict__.update(state)
+        self._init_process_state()
 
     def convert(self):
         """Main conversion method"""
@@ -73,284 +757,472 @@ class EvernoteToNextcloudConverter:
                 
                 print(f"Found {len(enex_files)} .enex files in directory")
             
-            recipe_zips = []
+            recipe_dirs = []
+            self.load_host_strategies()
             
             for enex_file in enex_files:
                 print(f"Processing: {enex_file.name}")
                 dirs = self.process_enex_file(enex_file)
-                recipe_zips.extend(dirs)
+                recipe_dirs.extend(dirs)
             
-            if recipe_zips:
-                self.create_export_zip(recipe_zips)
+            if recipe_dirs:
+                self.create_export_zip(recipe_dirs)
             else:
                 print("No recipes found to export")
             
+            self.save_host_strategies()
         finally:
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.discard_export_zip()
+            self.session.close()
 
-    def process_enex_file(self, enex_file: Path) -> List[Path]:
+    def process_enex_file(self, enex_file: Path) -> List[str]:
         """Process a single .enex file"""
         recipe_zips = []
         
         try:
-            tree = ET.parse(enex_file)
-            root = tree.getroot()
-            notes = root.findall('.//note')
-            
-            for note in notes:
-                recipe_zip = self.process_note(note)
-                if recipe_zip:
-                    recipe_zips.append(recipe_zip)
+            notes = self.iter_enex_notes(enex_file)
+            
+            # Extraction is CPU bound, so larger exports are spread over worker processes.
+            # Debug runs stay sequential to keep their output readable.
+            first_notes = (list(itertools.islice(notes, _PARALLEL_MIN_NOTES))
+                           if self.jobs > 1 and not self.debug else [])
+            if len(first_notes) >= _PARALLEL_MIN_NOTES:
+                recipe_zips = self.process_notes_in_parallel(itertools.chain(first_notes, notes))
+            else:
+                for note, fetch in self.prefetch_web_content(itertools.chain(first_notes, notes)):
+                    recipe_zip = self.process_note(note, fetch)
+                    # The note's content and image data are no longer needed
+                    note.clear()
+                    if recipe_zip:
+                        recipe_zips.append(recipe_zip)
                     
         except Exception as e:
             print(f"Error processing {enex_file}: {e}")
             
         return recipe_zips
 
-    def process_note(self, note: ET.Element) -> Optional[Path]:
-        """Convert a note to a recipe zip"""
-        try:
-            # Extract basic note data
-            title_elem = note.find('title')
-            content_elem = note.find('content')
-            created_elem = note.find('created')
-            
-            if title_elem is None or content_elem is None:
-                return None
-                
-            title = title_elem.text or "Untitled Recipe"
-            content = content_elem.text if content_elem.text is not None else ""
-            created = created_elem.text if created_elem is not None else None
+    def iter_enex_notes(self, enex_file: Path) -> Iterator[ET.Element]:
+        """Yield each note of an export as soon as it is parsed, instead of building the whole tree first"""
+        root = None
+        for event, elem in ET.iterparse(enex_file, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+            elif elem.tag == 'note':
+                yield elem
+                # Detach the processed note so the export root does not keep every note alive
+                try:
+                    root.remove(elem)
+                except ValueError:
+                    pass
+
+    def prefetch_web_content(self, notes: Iterable[ET.Element]) -> Iterator[Tuple[ET.Element, Optional[Future]]]:
+        """Yield notes in order with their web fetch already running in a background thread"""
+        # Without web fetching there is nothing to overlap, and debug output stays in order
+        if not self.enable_web_fetch or self.debug:
+            for note in notes:
+                yield note, None
+            return
+        
+        # Only a few notes are read ahead, so streaming large exports stays cheap on memory
+        with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as executor:
+            pending = deque()
+            for note in notes:
+                pending.append((note, executor.submit(self.fetch_note_web_content, note)))
+                if len(pending) > 2 * _FETCH_WORKERS:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+
+    def process_notes_in_parallel(self, notes: Iterable[ET.Element]) -> List[str]:
+        """Extract recipes in worker processes and write them in note order"""
+        recipe_zips = []
+        
+        def write_next():
+            """Write the oldest extracted recipe, recipes are numbered in the same order as the sequential path"""
+            note, future = pending.popleft()
+            try:
+                recipe_zip = self.write_recipe(future.result(), note)
+            except Exception as e:
+                print(f"Error processing note: {e}")
+                return
+            finally:
+                note.clear()
+            if recipe_zip:
+                recipe_zips.append(recipe_zip)
+        
+        # Each worker gets its copy of the converter once, tasks only carry the note and its page.
+        # Workers are spawned rather than forked: the fetch threads may be holding session or pool locks
+        # when the first worker starts, and spawning sends the converter through __getstate__/__setstate__
+        # on every platform.
+        with ProcessPoolExecutor(max_workers=self.jobs, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_extraction_worker, initargs=(self,)) as executor:
+            pending = deque()
+            # Web fetching stays in this process so requests to websites remain spaced out,
+            # notes are extracted as soon as their page has arrived
+            for note, fetch in self.prefetch_web_content(notes):
+                try:
+                    source_url, web_content = fetch.result() if fetch else self.fetch_note_web_content(note)
+                except Exception as e:
+                    print(f"Error processing note: {e}")
+                    continue
+                pending.append((note, executor.submit(_prepare_recipe_in_worker, note, source_url, web_content)))
+                while pending and pending[0][1].done():
+                    write_next()
             
-            # Get full ENML content including all child elements for fallback
-            if content_elem is not None:
-                fallback_text_content = ET.tostring(content_elem, encoding='unicode', method='xml')
-            else:
-                fallback_text_content = ""
+            while pending:
+                write_next()
+        
+        return recipe_zips
+
+    def process_note(self, note: ET.Element, fetch: Optional[Future] = None) -> Optional[str]:
+        """Convert a note to a recipe zip, using its prefetched web content when given"""
+        try:
+            source_url, web_content = fetch.result() if fetch else self.fetch_note_web_content(note)
+            prepared = self.prepare_recipe(note, source_url, web_content)
+            return self.write_recipe(prepared, note)
             
+        except Exception as e:
+            print(f"Error processing note: {e}")
+            return None
+
+    def fetch_note_web_content(self, note: ET.Element) -> Tuple[str, Optional[str]]:
+        """Find the note's source URL and fetch the recipe page when web fetching is enabled"""
+        title_elem = note.find('title')
+        content_elem = note.find('content')
+        
+        if title_elem is None or content_elem is None:
+            return "", None
+        
+        title = title_elem.text or "Untitled Recipe"
+        content = content_elem.text if content_elem.text is not None else ""
+        
+        if self.debug:
+            print(f"\n{'='*80}")
+            print(f"PROCESSING RECIPE: {title}")
+            print(f"{'='*80}")
+        
+        # First, try to extract source URL from content and note attributes
+        source_url = self.extract_source_url(content, title, note)
+        
+        web_content = None
+        if source_url and self.enable_web_fetch:
+            web_content = self.fetch_recipe_page(source_url)
+        
+        return source_url, web_content
+
+    def fetch_recipe_page(self, url: str) -> Optional[str]:
+        """Fetch a recipe page, one page at a time for each host"""
+        cached = self.read_known_page(url)
+        if cached is not None:
+            return cached or None
+        
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        
+        # Be respectful to websites: fetches from one host run one at a time and spaced out
+        with host_lock:
+            # Another note with the same page may have fetched it while this one waited for the host
+            cached = self.read_known_page(url)
+            if cached is not None:
+                return cached or None
+            
+            web_content = self.fetch_recipe_from_url(url)
+            self._fetched_pages[self.clean_recipe_url(url)] = web_content or ''
+            if web_content:
+                self.write_cached_page(url, web_content)
+        return web_content
+
+    def wait_for_host(self, host: str):
+        """Take a request token from the host's bucket, sleeping until one has refilled if it is empty"""
+        # Page fetches and image downloads share the bucket, so the token is reserved under the
+        # guard and a bucket in debt is waited out after releasing it
+        with self._host_locks_guard:
+            now = time.monotonic()
+            tokens, last_refill = self._host_buckets.get(host, (_HOST_FETCH_BURST, now))
+            tokens = min(_HOST_FETCH_BURST, tokens + (now - last_refill) / _HOST_FETCH_INTERVAL) - 1
+            self._host_buckets[host] = (tokens, now)
+        if tokens < 0:
+            time.sleep(-tokens * _HOST_FETCH_INTERVAL)
+
+    def read_known_page(self, url: str) -> Optional[str]:
+        """Return a page fetched before, an empty string if fetching it already failed in this run, or None"""
+        fetched = self._fetched_pages.get(self.clean_recipe_url(url))
+        if fetched is not None:
+            if self.debug:
+                print(f"    Using page fetched earlier in this run for {url}" if fetched
+                      else f"    Fetching {url} already failed earlier in this run")
+            return fetched
+        cached = self.read_cached_page(url)
+        if cached is not None and self.debug:
+            print(f"    Using cached page for {url}")
+        return cached
+
+    def load_host_strategies(self):
+        """Read the fetch strategies that worked for each host in earlier runs"""
+        if self.cache_dir is None:
+            return
+        try:
+            with open(self.cache_dir / 'host_strategies.json', encoding='utf-8') as f:
+                self._host_strategies.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def save_host_strategies(self):
+        """Remember which fetch strategy worked for each host for the next run"""
+        if self.cache_dir is None or not self._host_strategies:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / 'host_strategies.json', 'w', encoding='utf-8') as f:
+                json.dump(self._host_strategies, f, indent=1, sort_keys=True)
+        except OSError as e:
             if self.debug:
-                print(f"\n{'='*80}")
-                print(f"PROCESSING RECIPE: {title}")
-                print(f"{'='*80}")
-            
-            # First, try to extract source URL from content and note attributes
-            source_url = self.extract_source_url(content, title, note)
-            
-            # Try to fetch fresh content from URL with JSON-LD priority
-            web_content = None
-            if source_url and self.enable_web_fetch:
-                web_content = self.fetch_recipe_from_url(source_url)
-                if web_content:
+                print(f"Could not save host fetch strategies: {e}")
+
+    def _cached_page_path(self, url: str) -> Path:
+        """Cache file for a URL, keyed by a hash of the cleaned URL"""
+        key = hashlib.sha1(self.clean_recipe_url(url).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.html.gz"
+
+    def read_cached_page(self, url: str) -> Optional[str]:
+        """Return the cached copy of a fetched page, or None if there is none"""
+        if self.cache_dir is None:
+            return None
+        try:
+            with gzip.open(self._cached_page_path(url), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def write_cached_page(self, url: str, web_content: str):
+        """Store a fetched page in the cache, replacing any older copy atomically"""
+        if self.cache_dir is None:
+            return
+        path = self._cached_page_path(url)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(web_content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if self.debug:
+                print(f"    Could not cache page: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def prepare_recipe(self, note: ET.Element, source_url: str, web_content: Optional[str]) -> Optional[Dict]:
+        """Extract the recipe from a note and its fetched web content, without writing anything"""
+        # Extract basic note data
+        title_elem = note.find('title')
+        content_elem = note.find('content')
+        created_elem = note.find('created')
+        
+        if title_elem is None or content_elem is None:
+            return None
+            
+        title = title_elem.text or "Untitled Recipe"
+        content = content_elem.text if content_elem.text is not None else ""
+        created = created_elem.text if created_elem is not None else None
+        
+        # Get full ENML content including all child elements for fallback
+        if content_elem is not None:
+            fallback_text_content = ET.tostring(content_elem, encoding='unicode', method='xml')
+        else:
+            fallback_text_content = ""
+        
+        # Ingredients and instructions stay None unless web content validation already extracted them,
+        # images stay empty for web content
+        ingredients = instructions = None
+        images = []
+        
+        # Use fetched content from URL with JSON-LD priority
+        if source_url and self.enable_web_fetch:
+            if web_content:
+                if self.debug:
+                    print(f"    Fetched web content from: {source_url}")
+                
+                # PRIORITY 1: Try JSON-LD extraction
+                json_ld_recipe = self.extract_structured_recipe_data(web_content)
+                if json_ld_recipe:
+                    recipe_data = self.validate_and_use_json_ld_recipe(json_ld_recipe, title, created, source_url)
+                    if recipe_data:
+                        if self.debug:
+                            print(f"    SUCCESS: Using JSON-LD recipe data directly")
+                        # We have complete recipe data, skip text parsing and create recipe directly
+                        return {'json_ld': True, 'title': title, 'recipe_data': recipe_data}
+                
+                # PRIORITY 2: Fall back to HTML parsing if JSON-LD failed
+                if self.debug:
+                    print(f"    JSON-LD not found or invalid, falling back to HTML parsing")
+                # Use web content instead of Evernote content, but convert HTML to text first
+                text_content = self.extract_recipe_from_html(web_content)
+                if not text_content:
+                    # If HTML extraction failed, try basic HTML-to-text conversion
+                    text_content = self.html_to_text(web_content)
+                
+                # Validate HTML parsing results before proceeding
+                if text_content:
+                    # Test extract ingredients and instructions to see if we got useful content
                     if self.debug:
-                        print(f"    Fetched web content from: {source_url}")
+                        print(f"    Testing ingredient/instruction extraction on HTML content...")
+                        print(f"    HTML content preview: {text_content[:500]}...")
                     
-                    # PRIORITY 1: Try JSON-LD extraction
-                    json_ld_recipe = self.extract_structured_recipe_data(web_content)
-                    if json_ld_recipe:
-                        recipe_data = self.validate_and_use_json_ld_recipe(json_ld_recipe, title, created, source_url)
-                        if recipe_data:
-                            if self.debug:
-                                print(f"    SUCCESS: Using JSON-LD recipe data directly")
-                            # We have complete recipe data, skip text parsing and create recipe directly
-                            return self.create_recipe_from_json_ld(recipe_data, title, note)
+                    test_ingredients = self.extract_ingredients(text_content, title)
+                    test_instructions = self.extract_instructions(text_content, title)
                     
-                    # PRIORITY 2: Fall back to HTML parsing if JSON-LD failed
                     if self.debug:
-                        print(f"    JSON-LD not found or invalid, falling back to HTML parsing")
-                    # Use web content instead of Evernote content, but convert HTML to text first
-                    text_content = self.extract_recipe_from_html(web_content)
-                    if not text_content:
-                        # If HTML extraction failed, try basic HTML-to-text conversion
-                        text_content = self.html_to_text(web_content)
+                        print(f"    HTML parsing test results:")
+                        print(f"      - Ingredients found: {len(test_ingredients)}")
+                        print(f"      - Instructions found: {len(test_instructions)}")
+                        if test_ingredients:
+                            print(f"      - Sample ingredients: {test_ingredients[:3]}")
+                        if test_instructions:
+                            print(f"      - Sample instructions: {test_instructions[:2]}")
                     
-                    # IMPORTANT: Check if HTML parsing found JSON-LD that we missed in the first pass
-                    # This can happen with sites that have complex JSON-LD that needs special handling
-                    if text_content and text_content.startswith("# "):  # Looks like structured recipe text from JSON-LD
-                        if self.debug:
-                            print(f"    HTML parsing found structured data that looks like JSON-LD - re-checking for JSON-LD")
-                        # Try JSON-LD extraction again with more lenient parsing
-                        json_ld_recipe_retry = self.extract_structured_recipe_data(web_content)
-                        if json_ld_recipe_retry:
-                            recipe_data_retry = self.validate_and_use_json_ld_recipe(json_ld_recipe_retry, title, created, source_url)
-                            if recipe_data_retry:
-                                if self.debug:
-                                    print(f"    SUCCESS: Found JSON-LD on retry - using structured data")
-                                return self.create_recipe_from_json_ld(recipe_data_retry, title, note)
+                    # Enhanced validation: check if the web content is actually recipe-related
+                    is_valid_recipe_content = self.validate_web_recipe_content(web_content, title, source_url)
                     
-                    # Validate HTML parsing results before proceeding
-                    if text_content:
-                        # Test extract ingredients and instructions to see if we got useful content
-                        if self.debug:
-                            print(f"    Testing ingredient/instruction extraction on HTML content...")
-                            print(f"    HTML content preview: {text_content[:500]}...")
-                        
-                        test_ingredients = self.extract_ingredients(text_content, title)
-                        test_instructions = self.extract_instructions(text_content, title)
-                        
+                    # If HTML parsing failed to extract meaningful recipe content, fall back to Evernote
+                    if (len(test_ingredients) == 0 or len(test_instructions) == 0 or not is_valid_recipe_content):
                         if self.debug:
-                            print(f"    HTML parsing test results:")
-                            print(f"      - Ingredients found: {len(test_ingredients)}")
-                            print(f"      - Instructions found: {len(test_instructions)}")
-                            if test_ingredients:
-                                print(f"      - Sample ingredients: {test_ingredients[:3]}")
-                            if test_instructions:
-                                print(f"      - Sample instructions: {test_instructions[:2]}")
+                            validation_reason = []
+                            if len(test_ingredients) == 0:
+                                validation_reason.append("no ingredients")
+                            if len(test_instructions) == 0:
+                                validation_reason.append("no instructions")
+                            if not is_valid_recipe_content:
+                                validation_reason.append("content not recipe-related")
+                            print(f"    HTML parsing failed validation ({', '.join(validation_reason)})")
+                            print(f"    Discarding web content and falling back to Evernote content")
                         
-                        # Enhanced validation: check if the web content is actually recipe-related
-                        is_valid_recipe_content = self.validate_web_recipe_content(web_content, title, source_url)
-                        
-                        # If HTML parsing failed to extract meaningful recipe content, fall back to Evernote
-                        if (len(test_ingredients) == 0 or len(test_instructions) == 0 or not is_valid_recipe_content):
-                            if self.debug:
-                                validation_reason = []
-                                if len(test_ingredients) == 0:
-                                    validation_reason.append("no ingredients")
-                                if len(test_instructions) == 0:
-                                    validation_reason.append("no instructions")
-                                if not is_valid_recipe_content:
-                                    validation_reason.append("content not recipe-related")
-                                print(f"    HTML parsing failed validation ({', '.join(validation_reason)})")
-                                print(f"    Discarding web content and falling back to Evernote content")
-                            
-                            # CRITICAL: Completely discard contaminated web content
-                            web_content = None  # Clear the web content so it doesn't contaminate later processing
-                            text_content, images = self.parse_content_and_images(content, note)
-                            processing_method = "Evernote content (HTML parsing failed)"
-                        else:
-                            if self.debug:
-                                print(f"    HTML parsing successful (ingredients={len(test_ingredients)}, instructions={len(test_instructions)})")
-                            images = []  # Web content won't have embedded images
-                            processing_method = "HTML parsing (web content)"
-                    else:
-                        if self.debug:
-                            print(f"    HTML parsing returned no content, falling back to Evernote")
+                        # CRITICAL: Completely discard contaminated web content
+                        web_content = None  # Clear the web content so it doesn't contaminate later processing
                         text_content, images = self.parse_content_and_images(content, note)
                         processing_method = "Evernote content (HTML parsing failed)"
+                    else:
+                        if self.debug:
+                            print(f"    HTML parsing successful (ingredients={len(test_ingredients)}, instructions={len(test_instructions)})")
+                        images = []  # Web content won't have embedded images
+                        processing_method = "HTML parsing (web content)"
+                        # The test extraction ran on the text we are keeping, no need to repeat it
+                        ingredients, instructions = test_ingredients, test_instructions
                 else:
                     if self.debug:
-                        print(f"    Failed to fetch web content, using Evernote content")
-                    # PRIORITY 3: Fall back to Evernote content
+                        print(f"    HTML parsing returned no content, falling back to Evernote")
                     text_content, images = self.parse_content_and_images(content, note)
-                    processing_method = "Evernote content (web fetch failed)"
+                    processing_method = "Evernote content (HTML parsing failed)"
             else:
                 if self.debug:
-                    print(f"    No source URL found, using Evernote content")
-                # Parse content and extract images from Evernote
+                    print(f"    Failed to fetch web content, using Evernote content")
+                # PRIORITY 3: Fall back to Evernote content
                 text_content, images = self.parse_content_and_images(content, note)
-                processing_method = "Evernote content (no URL found)"
-            
-            # Ensure images is always defined (empty list for web content)
-            if 'images' not in locals():
-                images = []
-            
-            # Add small delay to be respectful to websites
-            if source_url and web_content:
-                time.sleep(1)
+                processing_method = "Evernote content (web fetch failed)"
+        else:
+            if self.debug:
+                print(f"    No source URL found, using Evernote content")
+            # Parse content and extract images from Evernote
+            text_content, images = self.parse_content_and_images(content, note)
+            processing_method = "Evernote content (no URL found)"
+        
+        if instructions is None:
             ingredients = self.extract_ingredients(text_content, title)
             instructions = self.extract_instructions(text_content, title)
-            description = self.extract_description(text_content)
-            
-            # Use the source_url we already extracted
-            final_source_url = source_url or ""
-            
-            # Post-process instructions to move misclassified ingredients back to ingredients list
-            final_ingredients, final_instructions = self.post_process_ingredients_from_instructions(ingredients, instructions, title)
-            
-            # Fallback: If no ingredients found, put entire note content as the ONLY instruction
-            if len(final_ingredients) == 0:
-                if self.debug:
-                    print(f"    No ingredients extracted - using full note content as complete fallback")
-                    print(f"    Processing method was: {processing_method}")
-                    print(f"    Fallback text content length: {len(fallback_text_content) if fallback_text_content else 0}")
-                    print(f"    Fallback content preview: {fallback_text_content[:200] if fallback_text_content else 'None'}...")
-                
-                # TODO: Fallback content extraction is broken for some recipes (1-2 cases so far)
-                # Issue: fallback_text_content contains full ENML XML but may still be too short/incomplete
-                # for some notes. The ET.tostring() approach should work but doesn't capture all content 
-                # in edge cases. Low priority fix since it only affects a small number of recipes.
-                
-                # Use the already-parsed text content for fallback
-                if fallback_text_content and len(fallback_text_content.strip()) > 10:
-                    # Replace ALL instructions with just the fallback content
-                    fallback_instruction = f"Recipe notes from Evernote:\n\n{fallback_text_content}"
-                    final_instructions = [fallback_instruction]
-                    
-                    if self.debug:
-                        print(f"    Replaced all instructions with fallback content ({len(fallback_text_content)} chars)")
-                        print(f"    Fallback instruction preview: {fallback_instruction[:300]}...")
-                        print(f"    Final instructions count: {len(final_instructions)}")
-                else:
-                    if self.debug:
-                        print(f"    Fallback text content too short or empty")
-                        print(f"    Raw fallback_text_content: '{fallback_text_content}'" if fallback_text_content else "    fallback_text_content is None/empty")
-                    # If no usable content, use a simple fallback
-                    final_instructions = ["See original Evernote note for recipe details."]
-            elif self.debug:
-                print(f"    Ingredients found ({len(final_ingredients)}), no fallback needed")
-            
+        description = self.extract_description(text_content)
+        
+        # Use the source_url we already extracted
+        final_source_url = source_url or ""
+        
+        # Post-process instructions to move misclassified ingredients back to ingredients list
+        final_ingredients, final_instructions = self.post_process_ingredients_from_instructions(ingredients, instructions, title)
+        
+        # Fallback: If no ingredients found, put entire note content as the ONLY instruction
+        if len(final_ingredients) == 0:
             if self.debug:
-                print(f"\n{'='*80}")
-                print(f"FINISHED PROCESSING: {title}")
-                print(f"  - Ingredients: {len(final_ingredients)}")
-                print(f"  - Instructions: {len(final_instructions)}")
-                print(f"  - Images: {len(images)}")
-                if final_source_url and web_content:
-                    print(f"  - Content source: Web (fetched from {final_source_url})")
-                elif final_source_url:
-                    print(f"  - Content source: Evernote (web fetch failed for {final_source_url})")
-                else:
-                    print(f"  - Content source: Evernote (no URL found)")
-                print(f"{'='*80}\n")
+                print(f"    No ingredients extracted - using full note content as complete fallback")
+                print(f"    Processing method was: {processing_method}")
+                print(f"    Fallback text content length: {len(fallback_text_content) if fallback_text_content else 0}")
+                print(f"    Fallback content preview: {fallback_text_content[:200] if fallback_text_content else 'None'}...")
             
-            # Create recipe data without image filenames first
-            self.recipe_counter += 1
-            recipe_data = self.create_recipe_data(
-                self.recipe_counter, title, description, 
-                final_ingredients, final_instructions, created, [], final_source_url
-            )
+            # TODO: Fallback content extraction is broken for some recipes (1-2 cases so far)
+            # Issue: fallback_text_content contains full ENML XML but may still be too short/incomplete
+            # for some notes. The ET.tostring() approach should work but doesn't capture all content 
+            # in edge cases. Low priority fix since it only affects a small number of recipes.
             
-            # Apply tag logic for HTML-parsed recipes as well
-            if web_content and processing_method == "HTML parsing (web content)":
-                # Apply the same tag logic we use for JSON-LD recipes
-                base_keywords = ["imported", "evernote"]
-                existing_keywords = []
-                
-                # Parse existing keywords if they exist in the recipe data
-                if recipe_data.get('keywords'):
-                    if isinstance(recipe_data['keywords'], str):
-                        existing_keywords = [k.strip() for k in recipe_data['keywords'].split(',') if k.strip()]
-                    elif isinstance(recipe_data['keywords'], list):
-                        existing_keywords = [str(k).strip() for k in recipe_data['keywords'] if str(k).strip()]
-                
-                # Apply tag logic
-                if self.override_tags:
-                    # Override completely with new tags
-                    final_keywords = self.override_tags
-                else:
-                    # Start with base keywords, add existing, then additional
-                    final_keywords = base_keywords.copy()
-                    # Add existing keywords that aren't already in base
-                    for keyword in existing_keywords:
-                        if keyword not in final_keywords:
-                            final_keywords.append(keyword)
-                    # Add additional tags
-                    if self.additional_tags:
-                        for tag in self.additional_tags:
-                            if tag not in final_keywords:
-                                final_keywords.append(tag)
-                
-                # Update keywords in recipe data
-                recipe_data['keywords'] = ', '.join(final_keywords)
+            # Use the already-parsed text content for fallback
+            if fallback_text_content and len(fallback_text_content.strip()) > 10:
+                # Replace ALL instructions with just the fallback content
+                fallback_instruction = f"Recipe notes from Evernote:\n\n{fallback_text_content}"
+                final_instructions = [fallback_instruction]
                 
                 if self.debug:
-                    print(f"    Applied tag logic to HTML-parsed recipe. Final keywords: {recipe_data['keywords']}")
-            
-            # Create recipe directory with images
-            return self.create_recipe_dir(self.recipe_counter, recipe_data, title, images, note, web_content, processing_method)
-            
-        except Exception as e:
-            print(f"Error processing note: {e}")
+                    print(f"    Replaced all instructions with fallback content ({len(fallback_text_content)} chars)")
+                    print(f"    Fallback instruction preview: {fallback_instruction[:300]}...")
+                    print(f"    Final instructions count: {len(final_instructions)}")
+            else:
+                if self.debug:
+                    print(f"    Fallback text content too short or empty")
+                    print(f"    Raw fallback_text_content: '{fallback_text_content}'" if fallback_text_content else "    fallback_text_content is None/empty")
+                # If no usable content, use a simple fallback
+                final_instructions = ["See original Evernote note for recipe details."]
+        elif self.debug:
+            print(f"    Ingredients found ({len(final_ingredients)}), no fallback needed")
+        
+        if self.debug:
+            print(f"\n{'='*80}")
+            print(f"FINISHED PROCESSING: {title}")
+            print(f"  - Ingredients: {len(final_ingredients)}")
+            print(f"  - Instructions: {len(final_instructions)}")
+            print(f"  - Images: {len(images)}")
+            if final_source_url and web_content:
+                print(f"  - Content source: Web (fetched from {final_source_url})")
+            elif final_source_url:
+                print(f"  - Content source: Evernote (web fetch failed for {final_source_url})")
+            else:
+                print(f"  - Content source: Evernote (no URL found)")
+            print(f"{'='*80}\n")
+        
+        # Build the recipe data with image placeholders and image filenames (recipes are numbered when written)
+        recipe_data, image = self.finalize_recipe_data(title, description, final_ingredients, created, final_source_url,
+                                                       images, note, web_content, processing_method, instructions)
+        
+        return {
+            'json_ld': False,
+            'title': title,
+            'recipe_data': recipe_data,
+            'image': image,
+            'processing_method': processing_method,
+            'fetched': bool(web_content)
+        }
+
+    def write_recipe(self, prepared: Optional[Dict], note: ET.Element) -> Optional[str]:
+        """Number a prepared recipe and write it to its recipe directory"""
+        if not prepared:
             return None
+        
+        if prepared['json_ld']:
+            return self.create_recipe_from_json_ld(prepared['recipe_data'], prepared['title'], note)
+        
+        self.recipe_counter += 1
+        return self.create_recipe_dir(self.recipe_counter, prepared['recipe_data'], prepared['title'],
+                                      prepared['image'], prepared['processing_method'], prepared['fetched'])
+
+    def merge_keywords(self, existing_keywords: Any = None) -> str:
+        """Combine the base keywords, a recipe's own keywords and the additional tags"""
+        if self.override_tags:
+            # Override completely with new tags
+            return ', '.join(self.override_tags)
+        
+        # Parse existing keywords if they exist
+        existing = []
+        if isinstance(existing_keywords, str):
+            existing = [k.strip() for k in existing_keywords.split(',') if k.strip()]
+        elif isinstance(existing_keywords, list):
+            existing = [str(k).strip() for k in existing_keywords if str(k).strip()]
+        
+        # Start with base keywords, add existing, then additional, keeping the first of any duplicates
+        return ', '.join(dict.fromkeys([*_BASE_KEYWORDS, *existing, *self.additional_tags]))
 
     def create_recipe_data(self, recipe_id: int, name: str, description: str,
                           ingredients: List[str], instructions: List[str], 
@@ -363,7 +1235,7 @@ class EvernoteToNextcloudConverter:
         for instruction in instructions:
             if instruction.strip():
                 # Check if this is an image placeholder
-                image_match = re.match(r'\[IMAGE_(\d+)\]', instruction)
+                image_match = _IMAGE_RE.match(instruction)
                 if image_match:
                     image_index = int(image_match.group(1))
                     if image_files and image_index < len(image_files):
@@ -386,19 +1258,6 @@ class EvernoteToNextcloudConverter:
                         "text": instruction.strip()
                     })
         
-        # Process keywords/tags
-        base_keywords = ["imported", "evernote"]
-        
-        # Apply tag logic
-        if self.override_tags:
-            # Override completely with new tags
-            final_keywords = self.override_tags
-        else:
-            # Start with base keywords and add additional tags
-            final_keywords = base_keywords.copy()
-            if self.additional_tags:
-                final_keywords.extend(self.additional_tags)
-        
         # Process categories
         final_category = "Imported"  # Default only for Evernote-only recipes
         
@@ -426,7 +1285,7 @@ class EvernoteToNextcloudConverter:
             "totalTime": "PT45M",
             "recipeCategory": final_category,
             "recipeCuisine": "",
-            "keywords": ", ".join(final_keywords),
+            "keywords": self.merge_keywords(),
             "recipeIngredient": [ingredient.strip() for ingredient in ingredients if ingredient.strip()],
             "recipeInstructions": processed_instructions,
             "nutrition": {
@@ -445,123 +1304,136 @@ class EvernoteToNextcloudConverter:
         
         return recipe
 
-    def create_recipe_dir(self, recipe_id: int, recipe_data: Dict, title: str, images: List[Dict], note: ET.Element, web_content: Optional[str] = None, processing_method: str = "Evernote content") -> Path:
-        """Create individual recipe directory for Nextcloud Recipes with images"""
-        # Create safe directory name
-        safe_title = re.sub(r'[^\w\s-]', '', title).strip()
-        safe_title = re.sub(r'[\s]+', '_', safe_title)
-        recipe_dir_name = f"{safe_title}_{recipe_id}"
-        
-        # Create recipe directory
-        recipe_dir = self.temp_dir / recipe_dir_name
-        recipe_dir.mkdir(exist_ok=True)
-        
-        # Extract and save images based on processing method
+    def finalize_recipe_data(self, title: str, description: str, ingredients: List[str], created: Optional[str], source_url: str,
+                             images: List[Dict], note: ET.Element, web_content: Optional[str] = None, processing_method: str = "Evernote content", original_instructions: Optional[List[str]] = None) -> Tuple[Dict, Optional[Dict]]:
+        """Build recipe data with image filenames and return it with the image to save"""
+        # Only use Evernote images if we have actual image data from Evernote content
         image_filenames = []
-        
-        # Only process Evernote images if we have actual image data from Evernote content
+        image = None
         if images and processing_method.startswith("Evernote content"):
-            try:
-                # Get the first image from Evernote content
-                image_info = images[0]
-                
-                # Save image file with "full" name
-                image_filename = f"full.{image_info['ext']}"
-                image_path = recipe_dir / image_filename
-                
-                with open(image_path, 'wb') as f:
-                    f.write(image_info['data'])
-                
-                image_filenames.append(image_filename)
-                if self.debug:
-                    print(f"    Saved Evernote image: {image_filename}")
-                
-            except Exception as e:
-                if self.debug:
-                    print(f"    Error saving Evernote image: {e}")
-        elif self.debug and not images:
-            print(f"    No images to process for {processing_method}")
-        elif self.debug:
-            print(f"    Skipping empty image list for {processing_method}")
+            # Get the first image from Evernote content, saved with "full" name
+            image = images[0]
+            image_filenames.append(f"full.{image['ext']}")
         
         # Update recipe data with actual image filenames and regenerate instructions
-        # Get the text content again to extract original instructions with placeholders
-        if web_content and processing_method == "HTML parsing (web content)":
-            # Only use web content if we're actually using HTML parsing method
-            # For HTML parsing, we need to convert HTML to text first
-            clean_web_text = self.extract_recipe_from_html(web_content)
-            if not clean_web_text:
-                clean_web_text = self.html_to_text(web_content)
-            original_instructions = self.extract_instructions(clean_web_text, recipe_data["name"])
-        elif web_content and processing_method != "HTML parsing (web content)":
-            # If we have web_content but we're not using it (fallback happened), ignore it completely
-            if self.debug:
-                print(f"    Ignoring web content due to processing method: {processing_method}")
-            # Re-parse Evernote content to get instructions with image placeholders
-            title_elem = note.find('title')
-            content_elem = note.find('content')
-            content = content_elem.text if content_elem is not None and content_elem.text is not None else ""
-            text_content, _ = self.parse_content_and_images(content, note)
-            original_instructions = self.extract_instructions(text_content, recipe_data["name"])
-        else:
-            # For Evernote content, re-parse to get instructions with image placeholders
-            title_elem = note.find('title')
-            content_elem = note.find('content')
-            content = content_elem.text if content_elem is not None and content_elem.text is not None else ""
-            
-            # Only parse with image placeholders if we're processing Evernote content
-            if processing_method.startswith("Evernote content"):
-                # Re-parse content to get instructions with image placeholders
+        # prepare_recipe passes the instructions it extracted, otherwise get the text content again
+        # to extract original instructions with placeholders
+        if original_instructions is None:
+            if web_content and processing_method == "HTML parsing (web content)":
+                # Only use web content if we're actually using HTML parsing method
+                # For HTML parsing, we need to convert HTML to text first
+                clean_web_text = self.extract_recipe_from_html(web_content)
+                if not clean_web_text:
+                    clean_web_text = self.html_to_text(web_content)
+                original_instructions = self.extract_instructions(clean_web_text, title)
+            elif web_content and processing_method != "HTML parsing (web content)":
+                # If we have web_content but we're not using it (fallback happened), ignore it completely
+                if self.debug:
+                    print(f"    Ignoring web content due to processing method: {processing_method}")
+                # Re-parse Evernote content to get instructions with image placeholders
+                content_elem = note.find('content')
+                content = content_elem.text if content_elem is not None and content_elem.text is not None else ""
                 text_content, _ = self.parse_content_and_images(content, note)
-                original_instructions = self.extract_instructions(text_content, recipe_data["name"])
+                original_instructions = self.extract_instructions(text_content, title)
             else:
-                # For other methods, just parse as plain text
-                text_content = self.parse_content(content)
-                original_instructions = self.extract_instructions(text_content, recipe_data["name"])
+                # For Evernote content, re-parse to get instructions with image placeholders
+                content_elem = note.find('content')
+                content = content_elem.text if content_elem is not None and content_elem.text is not None else ""
+                
+                # Only parse with image placeholders if we're processing Evernote content
+                if processing_method.startswith("Evernote content"):
+                    # Re-parse content to get instructions with image placeholders
+                    text_content, _ = self.parse_content_and_images(content, note)
+                    original_instructions = self.extract_instructions(text_content, title)
+                else:
+                    # For other methods, just parse as plain text
+                    text_content = self.parse_content(content)
+                    original_instructions = self.extract_instructions(text_content, title)
         
         # Apply post-processing to the original instructions to get the final clean list
-        _, clean_instructions = self.post_process_ingredients_from_instructions([], original_instructions, recipe_data["name"])
+        _, clean_instructions = self.post_process_ingredients_from_instructions([], original_instructions, title)
         
-        # Recreate the recipe data with proper image filenames
-        updated_recipe_data = self.create_recipe_data(
-            recipe_id, recipe_data["name"], recipe_data["description"], 
-            recipe_data["recipeIngredient"], clean_instructions,
-            recipe_data.get("dateCreated"), image_filenames, recipe_data.get("url", "")
+        # Create the recipe data with proper image filenames
+        recipe_data = self.create_recipe_data(
+            0, title, description, 
+            ingredients, clean_instructions,
+            created, image_filenames, source_url
         )
         
         # Set the main recipe image (only first image if available)
         if image_filenames:
             # Only put the first image as the main recipe image
-            updated_recipe_data["image"] = image_filenames[0]
+            recipe_data["image"] = image_filenames[0]
         else:
-            updated_recipe_data["image"] = ""
+            recipe_data["image"] = ""
+        
+        return recipe_data, image
+
+    def create_recipe_dir(self, recipe_id: int, recipe_data: Dict, title: str, image: Optional[Dict], processing_method: str = "Evernote content", fetched: bool = False) -> str:
+        """Create individual recipe directory for Nextcloud Recipes with images"""
+        # Create safe directory name
+        recipe_dir_name = f"{_safe_title(title)}_{recipe_id}"
+        
+        recipe_files: Dict[str, bytes] = {}
+        
+        # Save the Evernote image picked by finalize_recipe_data
+        image_count = 0
+        if image:
+            try:
+                image_filename = recipe_data["image"]
+                recipe_files[image_filename] = base64.b64decode(image['base64'])
+                
+                image_count = 1
+                if self.debug:
+                    print(f"    Saved Evernote image: {image_filename}")
+                
+            except Exception as e:
+                if self.debug:
+                    print(f"    Error saving Evernote image: {e}")
+        elif self.debug:
+            print(f"    No images to process for {processing_method}")
         
         # Create recipe.json file in the directory
-        json_file = recipe_dir / "recipe.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(updated_recipe_data, f, indent=2, ensure_ascii=False)
+        recipe_files["recipe.json"] = json.dumps(recipe_data, indent=2, ensure_ascii=False).encode('utf-8')
+        self.write_recipe_files(recipe_dir_name, recipe_files)
         
         # Show processing result with URL info
         url_info = ""
-        if recipe_data.get("url") and web_content:
+        if recipe_data.get("url") and fetched:
             url_info = f" (fetched from {recipe_data['url']})"
         elif recipe_data.get("url"):
             url_info = f" (web fetch failed for {recipe_data['url']})"
         
-        print(f"  Recipe {recipe_id}: {title} ({len(image_filenames)} images){url_info}")
+        print(f"  Recipe {recipe_id}: {title} ({image_count} images){url_info}")
         print(f"    ✓ Processing method: {processing_method}")
-        return recipe_dir
-
-    def create_export_zip(self, recipe_dirs: List[Path]):
-        """Create main export zip with recipe directories"""
-        with zipfile.ZipFile(self.output_file, 'w', zipfile.ZIP_DEFLATED) as main_zip:
-            for recipe_dir in recipe_dirs:
-                # Add all files in the recipe directory to the zip
-                for file_path in recipe_dir.rglob('*'):
-                    if file_path.is_file():
-                        # Create the archive path: recipe_dir_name/filename
-                        archive_path = recipe_dir.name + '/' + file_path.relative_to(recipe_dir).as_posix()
-                        main_zip.write(file_path, archive_path)
+        return recipe_dir_name
+
+    def _partial_export_path(self) -> Path:
+        """Path the export zip is written to until the conversion finishes"""
+        return self.output_file.with_name(self.output_file.name + '.part')
+
+    def write_recipe_files(self, recipe_dir_name: str, recipe_files: Dict[str, bytes]):
+        """Add a recipe directory's files to the export zip"""
+        if self._export_zip is None:
+            self._export_zip = zipfile.ZipFile(self._partial_export_path(), 'w', zipfile.ZIP_DEFLATED)
+        
+        for filename, data in recipe_files.items():
+            # Images are already compressed, deflating them again only costs time
+            compress_type = zipfile.ZIP_STORED if filename.lower().endswith(_COMPRESSED_IMAGE_EXTENSIONS) else None
+            self._export_zip.writestr(f"{recipe_dir_name}/{filename}", data, compress_type=compress_type)
+
+    def discard_export_zip(self):
+        """Close and remove an export zip that was not completed"""
+        if self._export_zip is not None:
+            self._export_zip.close()
+            self._export_zip = None
+            self._partial_export_path().unlink(missing_ok=True)
+
+    def create_export_zip(self, recipe_dirs: List[str]):
+        """Finish the main export zip holding the recipe directories"""
+        self._export_zip.close()
+        self._export_zip = None
+        os.replace(self._partial_export_path(), self.output_file)
         
         print(f"\nExport created: {self.output_file}")
         print(f"Recipes: {len(recipe_dirs)}")
@@ -575,7 +1447,7 @@ class EvernoteToNextcloudConverter:
         # Extract images from resources in the note and create a mapping
         images = []
         image_hash_to_data = {}
-        resources = note.findall('.//resource')
+        resources = note.findall('resource')
         
         for resource in resources:
             try:
@@ -587,41 +1459,20 @@ class EvernoteToNextcloudConverter:
                     # Check if it's an image
                     mime_type = mime_elem.text
                     if mime_type and mime_type.startswith('image/'):
-                        # Get the hash attribute for matching with en-media tags
-                        # Try multiple ways to get the hash
-                        resource_hash = None
-                        
-                        # Check data element attributes first
-                        if hasattr(data_elem, 'attrib'):
-                            for attr_name, attr_value in data_elem.attrib.items():
-                                if 'hash' in attr_name.lower():
-                                    resource_hash = attr_value
-                                    break
+                        # Get the hash attribute for matching with en-media tags,
+                        # checking the data element first and then the resource
+                        resource_hash = data_elem.get('hash') or resource.get('hash')
                         
-                        # Check resource element attributes
-                        if not resource_hash and hasattr(resource, 'attrib'):
-                            for attr_name, attr_value in resource.attrib.items():
-                                if 'hash' in attr_name.lower():
-                                    resource_hash = attr_value
-                                    break
-                        
-                        # If still no hash found, create one from the data
-                        if not resource_hash and data_elem.text:
-                            resource_hash = hashlib.md5(data_elem.text.encode()).hexdigest()
+                        if not data_elem.text:
+                            continue  # Skip if no image data
                         
-                        # Skip if we still don't have a hash
+                        # If still no hash found, create one from the decoded data like Evernote does
                         if not resource_hash:
-                            continue
+                            resource_hash = hashlib.md5(base64.b64decode(data_elem.text)).hexdigest()
                         
                         if self.debug:
                             print(f"    Found image with hash: {resource_hash[:8]}...")
                         
-                        # Decode base64 image data
-                        if data_elem.text:
-                            image_data = base64.b64decode(data_elem.text)
-                        else:
-                            continue  # Skip if no image data
-                        
                         # Determine file extension from mime type
                         ext_map = {
                             'image/jpeg': 'jpg',
@@ -633,8 +1484,9 @@ class EvernoteToNextcloudConverter:
                         }
                         ext = ext_map.get(mime_type, 'jpg')
                         
+                        # Kept as base64 text, only the image that gets saved is ever decoded
                         image_info = {
-                            'data': image_data,
+                            'base64': data_elem.text,
                             'mime': mime_type,
                             'ext': ext,
                             'hash': resource_hash
@@ -660,15 +1512,9 @@ class EvernoteToNextcloudConverter:
         # Decode HTML entities
         content = html.unescape(content)
         
-        # Remove ENML wrapper
-        content = re.sub(r'<\?xml[^>]*\?>', '', content)
-        content = re.sub(r'<!DOCTYPE[^>]*>', '', content)
-        content = re.sub(r'<en-note[^>]*>', '', content)
-        content = re.sub(r'</en-note>', '', content)
-        
         # Replace en-media tags with image placeholders
         def replace_media(match):
-            hash_attr = match.group(1)
+            hash_attr = match.group('hash')
             if self.debug:
                 print(f"    Found en-media tag with hash: {hash_attr[:8]}...")
             if hash_attr in image_hash_to_data:
@@ -681,24 +1527,13 @@ class EvernoteToNextcloudConverter:
                     print(f"    Hash not found in mapping")
             return "\n[IMAGE]\n"
         
-        content = re.sub(r'<en-media[^>]*hash="([^"]*)"[^>]*/?>', replace_media, content)
-        
-        # Handle checkboxes and convert to unicode
-        content = re.sub(r'<en-todo[^>]*checked="true"[^>]*>', '✓ ', content)
-        content = re.sub(r'<en-todo[^>]*>', '☐ ', content)
-        
-        # Convert line breaks and divs to newlines
-        content = re.sub(r'<br[^>]*>', '\n', content)
-        content = re.sub(r'<div[^>]*>', '\n', content)
-        content = re.sub(r'</div>', '', content)
-        
-        # Remove remaining HTML tags
-        content = re.sub(r'<[^>]+>', '\n', content)
+        # Strip the ENML wrapper, convert checkboxes to unicode and other tags to newlines
+        content = _replace_enml_tags(content, replace_media)
         
         # Clean up whitespace
-        content = re.sub(r'\n+', '\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
-        content = re.sub(r'^\s+|\s+$', '', content, flags=re.MULTILINE)
+        content = _MULTI_NEWLINE_RE.sub('\n', content)
+        content = _INLINE_WS_RE.sub(' ', content)
+        content = _LINE_TRIM_RE.sub('', content)
         
         return content.strip()
 
@@ -718,34 +1553,6 @@ class EvernoteToNextcloudConverter:
             if clean_url != url:
                 print(f"    Cleaned URL: {clean_url}")
         
-        # Quick connectivity test
-        try:
-            import socket
-            host = urlparse(clean_url).netloc
-            if self.debug:
-                print(f"    Testing connectivity to {host}...")
-            
-            # Test basic DNS resolution and connectivity
-            socket.create_connection((host, 443 if clean_url.startswith('https') else 80), timeout=5)
-            if self.debug:
-                print(f"    Connectivity test passed")
-        except Exception as e:
-            if self.debug:
-                print(f"    Connectivity test failed: {e}")
-            return None
-        
-        # Quick HTTP test to verify we can actually make requests
-        try:
-            if self.debug:
-                print(f"    Testing basic HTTP request...")
-            test_response = requests.get(clean_url, timeout=5, allow_redirects=False)
-            if self.debug:
-                print(f"    Basic HTTP test result: {test_response.status_code}")
-        except Exception as e:
-            if self.debug:
-                print(f"    Basic HTTP test failed: {e}")
-            # Don't return None here, still try the strategies
-        
         # Try multiple strategies in order of preference
         strategies = [
             self._fetch_with_simple_headers,
@@ -764,26 +1571,43 @@ class EvernoteToNextcloudConverter:
             self._fetch_with_no_ssl_verification,  # Last resort for SSL issues
         ]
         
+        # Start with whatever worked for this host before, stubborn sites otherwise burn through every failing strategy
+        host = urlparse(clean_url).netloc.lower()
+        preferred = self._host_strategies.get(host)
+        if preferred:
+            strategies.sort(key=lambda strategy: strategy.__name__ != preferred)
+        
+        backoffs = 0
+        backed_off = 0.0
         for i, strategy in enumerate(strategies, 1):
             if self.debug:
                 strategy_name = strategy.__name__.replace('_fetch_with_', '').replace('_', ' ')
                 print(f"    Trying strategy {i} ({strategy_name})...")
             
             try:
+                # Every strategy is a request of its own, so each one waits for the host's rate limit
+                self.wait_for_host(host)
                 result = strategy(clean_url)
                 if result:
                     if self.debug:
                         print(f"    Strategy {i} succeeded!")
+                    self._host_strategies[host] = strategy.__name__
                     return result
                 else:
                     if self.debug:
                         print(f"    Strategy {i} returned empty result")
+            except requests.exceptions.ConnectionError as e:
+                # Other headers will not help when the host cannot be reached at all
+                if _host_unreachable(e):
+                    if self.debug:
+                        print(f"    Strategy {i} could not connect, giving up on URL: {e}")
+                    return None
+                if self.debug:
+                    print(f"    Strategy {i} failed with exception: {type(e).__name__}: {e}")
+                continue
             except requests.exceptions.Timeout as e:
                 if self.debug:
                     print(f"    Strategy {i} timed out: {e}")
-                # For major sites, add a delay before trying next strategy
-                if any(site in clean_url.lower() for site in ['seriouseats.com', 'nytimes.com']):
-                    time.sleep(1)
                 continue
             except requests.exceptions.HTTPError as e:
                 if self.debug:
@@ -792,12 +1616,19 @@ class EvernoteToNextcloudConverter:
                     if hasattr(e, 'response') and e.response is not None:
                         print(f"    Response URL: {e.response.url}")
                         print(f"    Response headers: {dict(list(e.response.headers.items())[:5])}")
-                # For 403/429 errors on major sites, add delay
-                if hasattr(e, 'response') and e.response.status_code in [403, 429]:
-                    if any(site in clean_url.lower() for site in ['seriouseats.com', 'nytimes.com']):
+                if e.response is not None and e.response.status_code in _TERMINAL_HTTP_STATUSES:
+                    if self.debug:
+                        print(f"    Page is gone or not accessible, giving up on URL")
+                    return None
+                # Give rate limiting or overloaded hosts the room they ask for before the next attempt
+                if e.response is not None and (e.response.status_code in _BACKOFF_STATUSES
+                                               or 'Retry-After' in e.response.headers):
+                    if backed_off >= _MAX_URL_BACKOFF:
                         if self.debug:
-                            print(f"    Adding delay for {e.response.status_code} error on major site")
-                        time.sleep(2)
+                            print(f"    Host still refusing after {backed_off:.1f}s of backoff, giving up on URL")
+                        return None
+                    backed_off += self._backoff(backoffs, e.response, _MAX_URL_BACKOFF - backed_off)
+                    backoffs += 1
                 continue
             except Exception as e:
                 if self.debug:
@@ -807,49 +1638,37 @@ class EvernoteToNextcloudConverter:
         if self.debug:
             print(f"    All strategies failed for URL")
         return None
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None,
+                 limit: float = _MAX_BACKOFF) -> float:
+        """Wait before the next fetch strategy, as long as Retry-After asks or exponentially longer with jitter"""
+        delay = _retry_after_seconds(response)
+        if delay is None:
+            delay = 2 ** attempt + random.random()
+        delay = min(_MAX_BACKOFF, limit, delay)
+        if self.debug:
+            print(f"    Waiting {delay:.1f}s before the next strategy")
+        time.sleep(delay)
+        return delay
     
     def clean_recipe_url(self, url: str) -> str:
         """Clean up recipe URL by removing unnecessary parameters and fragments"""
-        if not url:
-            return url
-        
-        # Remove fragment (anchor)
-        if '#' in url:
-            url = url.split('#')[0]
-        
-        # Remove common tracking and unnecessary parameters
-        if '?' in url:
-            base_url, params = url.split('?', 1)
-            param_pairs = params.split('&')
-            
-            # Keep only essential parameters
-            keep_params = []
-            essential_params = ['id', 'recipe', 'post', 'p', 'page']
-            
-            for param in param_pairs:
-                if '=' in param:
-                    param_name = param.split('=')[0].lower()
-                    if any(essential in param_name for essential in essential_params):
-                        keep_params.append(param)
-            
-            if keep_params:
-                url = base_url + '?' + '&'.join(keep_params)
-            else:
-                url = base_url
-        
-        return url
+        return _clean_recipe_url(url)
 
-    def _process_response(self, response) -> Optional[str]:
+    def _process_response(self, response, text: Optional[str] = None) -> Optional[str]:
         """Process HTTP response and return raw HTML content for JSON-LD extraction"""
         if response.status_code != 200:
             return None
         
-        if len(response.text) < 100:
+        # response.text decodes the whole body on every access, so decode it once
+        if text is None:
+            text = response.text
+        if len(text) < 100:
             return None
         
         # Return raw HTML content so we can extract JSON-LD from it
         # Don't extract recipe content here - that happens later in the main flow
-        return response.text
+        return text
 
     def _fetch_with_simple_headers(self, url: str) -> Optional[str]:
         """Fetch with simple browser headers"""
@@ -858,7 +1677,8 @@ class EvernoteToNextcloudConverter:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
+            # Unreachable hosts fail within the short connect timeout
+            response = self.session.get(url, headers=headers, timeout=(5, 15), allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -874,7 +1694,7 @@ class EvernoteToNextcloudConverter:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=15, allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -885,7 +1705,7 @@ class EvernoteToNextcloudConverter:
     def _fetch_with_basic_requests(self, url: str) -> Optional[str]:
         """Fetch with basic requests (no custom headers)"""
         try:
-            response = requests.get(url, timeout=15, allow_redirects=True)
+            response = self.session.get(url, timeout=15, allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -906,7 +1726,7 @@ class EvernoteToNextcloudConverter:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=20, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=20, allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -921,7 +1741,7 @@ class EvernoteToNextcloudConverter:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=10, allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -935,7 +1755,7 @@ class EvernoteToNextcloudConverter:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _BROWSER_ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -946,7 +1766,7 @@ class EvernoteToNextcloudConverter:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=25, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=25, allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -960,14 +1780,14 @@ class EvernoteToNextcloudConverter:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.1 Safari/605.1.15',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _BROWSER_ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=25, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=25, allow_redirects=True)
             response.raise_for_status()
             return self._process_response(response)
         except Exception as e:
@@ -981,41 +1801,35 @@ class EvernoteToNextcloudConverter:
             if self.debug:
                 print(f"      Making bare session request to: {url} (SSL verification: ON)")
             
-            with requests.Session() as session:
-                # Add minimal delay to be respectful
-                time.sleep(0.5)
-                
-                response = session.get(url, timeout=20, verify=True, allow_redirects=True)  # Ensure redirects are followed
+            response = self.session.get(url, timeout=20, verify=True, allow_redirects=True)  # Ensure redirects are followed
+            
+            if self.debug:
+                print(f"      Got response: {response.status_code}")
+                print(f"      Content length: {len(response.content)}")
+            
+            # Be very lenient with status codes
+            if response.status_code in [200, 301, 302, 304]:
+                # Try to process even if it's not perfect
+                return self._process_response_lenient(response)
+            else:
+                response.raise_for_status()
+                return self._process_response_lenient(response)
                 
+        except requests.exceptions.SSLError as e:
+            if self.debug:
+                print(f"      Requests session - SSL ERROR: {e}")
+                print(f"      Retrying with SSL verification disabled...")
+            # Try without SSL verification as fallback
+            try:
+                response = self.session.get(url, timeout=20, verify=False, allow_redirects=True)
                 if self.debug:
-                    print(f"      Got response: {response.status_code}")
-                    print(f"      Content length: {len(response.text)}")
+                    print(f"      Got response (no SSL): {response.status_code}")
                 
-                # Be very lenient with status codes
                 if response.status_code in [200, 301, 302, 304]:
-                    # Try to process even if it's not perfect
                     return self._process_response_lenient(response)
                 else:
                     response.raise_for_status()
                     return self._process_response_lenient(response)
-                    
-        except requests.exceptions.SSLError as e:
-            if self.debug:
-                print(f"      Requests session - SSL ERROR: {e}")
-                print(f"      Retrying with SSL verification disabled...")
-            # Try without SSL verification as fallback
-            try:
-                with requests.Session() as session:
-                    time.sleep(0.5)
-                    response = session.get(url, timeout=20, verify=False, allow_redirects=True)
-                    if self.debug:
-                        print(f"      Got response (no SSL): {response.status_code}")
-                    
-                    if response.status_code in [200, 301, 302, 304]:
-                        return self._process_response_lenient(response)
-                    else:
-                        response.raise_for_status()
-                        return self._process_response_lenient(response)
             except Exception as e2:
                 if self.debug:
                     print(f"      Requests session - SSL fallback also failed: {e2}")
@@ -1027,22 +1841,24 @@ class EvernoteToNextcloudConverter:
 
     def _process_response_lenient(self, response) -> Optional[str]:
         """Process response with very lenient validation for difficult sites"""
+        text = response.text
         if self.debug:
-            print(f"      Lenient processing - status: {response.status_code}, length: {len(response.text)}")
+            print(f"      Lenient processing - status: {response.status_code}, length: {len(text)}")
         
         # Very minimal validation - just check we got some content
-        if len(response.text) < 20:
+        if len(text) < 20:
             if self.debug:
                 print(f"      Response too short for lenient processing")
             return None
         
         # Skip most validation for major recipe sites - just try to extract content
-        if any(site in response.url.lower() for site in ['seriouseats.com', 'nytimes.com', 'foodnetwork.com', 'allrecipes.com']):
+        url_lower = response.url.lower()
+        if any(site in url_lower for site in _LENIENT_MAJOR_SITES):
             if self.debug:
                 print(f"      Major recipe site - skipping most validation")
             
             # Try to extract recipe content directly without strict validation
-            recipe_content = self.extract_recipe_from_html(response.text)
+            recipe_content = self.extract_recipe_from_html(text)
             
             if recipe_content and len(recipe_content.strip()) > 20:
                 if self.debug:
@@ -1050,21 +1866,21 @@ class EvernoteToNextcloudConverter:
                 return recipe_content
             else:
                 # If recipe extraction fails, return raw HTML-to-text conversion
-                raw_text = self.html_to_text(response.text)
+                raw_text = self.html_to_text_prefix(text, 2000)
                 if len(raw_text.strip()) > 100:
                     if self.debug:
                         print(f"      Fallback to raw text conversion: {len(raw_text)} characters")
                     return raw_text[:2000]  # Limit to reasonable size
         
         # Special handling for ediblecommunities.com sites - be very lenient
-        if 'ediblecommunities.com' in response.url.lower():
+        if 'ediblecommunities.com' in url_lower:
             if self.debug:
                 print(f"      Edible communities site - using ultra-lenient processing")
             
             # Accept any response with substantial content, even with error codes
-            if len(response.text) > 500:
+            if len(text) > 500:
                 # Try recipe extraction first
-                recipe_content = self.extract_recipe_from_html(response.text)
+                recipe_content = self.extract_recipe_from_html(text)
                 
                 if recipe_content and len(recipe_content.strip()) > 50:
                     if self.debug:
@@ -1072,7 +1888,7 @@ class EvernoteToNextcloudConverter:
                     return recipe_content
                 else:
                     # Fall back to raw text conversion for edible sites
-                    raw_text = self.html_to_text(response.text)
+                    raw_text = self.html_to_text_prefix(text, 3000)
                     if len(raw_text.strip()) > 200:
                         if self.debug:
                             print(f"      Edible site raw text fallback: {len(raw_text)} characters")
@@ -1080,10 +1896,10 @@ class EvernoteToNextcloudConverter:
             
             # Show some debug info about what we got
             if self.debug:
-                print(f"      Edible site response preview: {response.text[:500]}...")
+                print(f"      Edible site response preview: {text[:500]}...")
         
         # For other sites, use normal processing
-        return self._process_response(response)
+        return self._process_response(response, text)
 
     def _fetch_with_extended_timeout(self, url: str) -> Optional[str]:
         """Fetch with extended timeouts and delays for very slow/stubborn sites"""
@@ -1100,26 +1916,18 @@ class EvernoteToNextcloudConverter:
             'Pragma': 'no-cache',
         }
         
-        session = None
         try:
-            session = requests.Session()
-            session.headers.update(headers)
-            session.verify = False  # Disable SSL for stubborn sites
-            
             if self.debug:
                 print(f"      Making extended timeout request to: {url}")
             
-            # Add extended delay to be respectful
-            time.sleep(5)
-            
-            response = session.get(url, timeout=60, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=60, verify=False, allow_redirects=True)
             
             if self.debug:
                 print(f"      Got response: {response.status_code}")
-                print(f"      Content length: {len(response.text)}")
+                print(f"      Content length: {len(response.content)}")
             
             # Be very lenient with status codes
-            if response.status_code in [200, 301, 302, 304, 403, 429] and len(response.text) > 100:
+            if response.status_code in [200, 301, 302, 304, 403, 429] and len(response.content) > 100:
                 return self._process_response_lenient(response)
             else:
                 response.raise_for_status()
@@ -1129,9 +1937,6 @@ class EvernoteToNextcloudConverter:
             if self.debug:
                 print(f"      Extended timeout - ERROR: {type(e).__name__}: {e}")
             raise
-        finally:
-            if session:
-                session.close()
 
     def _fetch_with_no_ssl_verification(self, url: str) -> Optional[str]:
         """Last resort fetch with no SSL verification and very permissive settings"""
@@ -1139,7 +1944,7 @@ class EvernoteToNextcloudConverter:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _BROWSER_ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -1151,27 +1956,19 @@ class EvernoteToNextcloudConverter:
             'Referer': 'https://www.google.com/',
         }
         
-        session = None
         try:
-            session = requests.Session()
-            session.headers.update(headers)
-            session.verify = False  # No SSL verification at all
-            
             if self.debug:
                 print(f"      Making no-SSL request to: {url}")
             
-            # Extended delay and timeout for last resort
-            time.sleep(7)
-            
-            response = session.get(url, timeout=90, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=90, verify=False, allow_redirects=True)
             
             if self.debug:
                 print(f"      Got response: {response.status_code}")
-                print(f"      Content length: {len(response.text)}")
+                print(f"      Content length: {len(response.content)}")
                 print(f"      Headers: {dict(list(response.headers.items())[:5])}")
             
             # Accept any response that has substantial content
-            if response.status_code in [200, 301, 302, 304, 403, 429, 500, 503] and len(response.text) > 100:
+            if response.status_code in [200, 301, 302, 304, 403, 429, 500, 503] and len(response.content) > 100:
                 return self._process_response_lenient(response)
             else:
                 if self.debug:
@@ -1183,9 +1980,6 @@ class EvernoteToNextcloudConverter:
             if self.debug:
                 print(f"      No SSL verification - ERROR: {type(e).__name__}: {e}")
             raise
-        finally:
-            if session:
-                session.close()
 
     def _fetch_with_firefox_headers(self, url: str) -> Optional[str]:
         """Fetch with Firefox-specific headers"""
@@ -1199,17 +1993,11 @@ class EvernoteToNextcloudConverter:
             'Upgrade-Insecure-Requests': '1',
         }
         
-        session = None
         try:
-            session = requests.Session()
-            session.headers.update(headers)
-            session.verify = False
-            
             if self.debug:
                 print(f"      Making Firefox-style request to: {url}")
             
-            time.sleep(2)
-            response = session.get(url, timeout=25, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=25, verify=False, allow_redirects=True)
             
             if self.debug:
                 print(f"      Got response: {response.status_code}")
@@ -1221,9 +2009,6 @@ class EvernoteToNextcloudConverter:
             if self.debug:
                 print(f"      Firefox headers - ERROR: {type(e).__name__}: {e}")
             raise
-        finally:
-            if session:
-                session.close()
     
     def _fetch_with_edge_headers(self, url: str) -> Optional[str]:
         """Fetch with Edge-specific headers as another fallback"""
@@ -1231,7 +2016,7 @@ class EvernoteToNextcloudConverter:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _BROWSER_ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -1241,17 +2026,11 @@ class EvernoteToNextcloudConverter:
             'Sec-Fetch-User': '?1',
         }
         
-        session = None
         try:
-            session = requests.Session()
-            session.headers.update(headers)
-            session.verify = False
-            
             if self.debug:
                 print(f"      Making Edge-style request to: {url}")
             
-            time.sleep(2)
-            response = session.get(url, timeout=25, allow_redirects=True)
+            response = self.session.get(url, headers=headers, timeout=25, verify=False, allow_redirects=True)
             
             if self.debug:
                 print(f"      Got response: {response.status_code}")
@@ -1263,44 +2042,37 @@ class EvernoteToNextcloudConverter:
             if self.debug:
                 print(f"      Edge headers - ERROR: {type(e).__name__}: {e}")
             raise
-        finally:
-            if session:
-                session.close()
 
     def extract_recipe_from_html(self, html_content: str) -> Optional[str]:
         """Extract recipe content from HTML"""
         try:
             # Look for JSON-LD structured data first
-            json_ld_patterns = [
-                r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-                r'<script[^>]*type=["\']application/ld\+json["\']>(.*?)</script>',
-            ]
-            
-            for pattern in json_ld_patterns:
-                matches = re.findall(pattern, html_content, re.DOTALL | re.IGNORECASE)
-                for match in matches:
-                    if self.debug:
-                        print(f"    Found JSON-LD block: {match[:200]}...")
+            for match in _json_ld_blocks(html_content):
+                if self.debug:
+                    print(f"    Found JSON-LD block: {match[:200]}...")
+                try:
                     try:
+                        json_data = json.loads(match)
+                    except json.JSONDecodeError:
                         # Clean up the JSON (remove comments, extra whitespace)
-                        clean_json = re.sub(r'//.*?\n', '', match)  # Remove JS comments
-                        clean_json = re.sub(r'/\*.*?\*/', '', clean_json, flags=re.DOTALL)  # Remove block comments
-                        
+                        clean_json = _JS_LINE_COMMENT_RE.sub('', match)  # Remove JS comments
+                        clean_json = _JS_BLOCK_COMMENT_RE.sub('', clean_json)  # Remove block comments
                         json_data = json.loads(clean_json)
-                        recipe_data = self.extract_from_json_ld(json_data)
-                        if recipe_data:
-                            if self.debug:
-                                print(f"    Successfully extracted recipe from JSON-LD")
-                            return recipe_data
-                    except json.JSONDecodeError as e:
+                    
+                    recipe_data = self.extract_from_json_ld(json_data)
+                    if recipe_data:
                         if self.debug:
-                            print(f"    JSON parsing error: {e}")
-                        continue
+                            print(f"    Successfully extracted recipe from JSON-LD")
+                        return recipe_data
+                except json.JSONDecodeError as e:
+                    if self.debug:
+                        print(f"    JSON parsing error: {e}")
+                    continue
             
             if self.debug:
                 print(f"    No valid JSON-LD found, trying HTML parsing...")
                 # Diagnostic: Show what class names exist in the HTML
-                class_matches = re.findall(r'class=["\']([^"\']*)["\']', html_content, re.IGNORECASE)
+                class_matches = _HTML_CLASS_ATTR_RE.findall(html_content)
                 unique_classes = set()
                 for class_attr in class_matches[:50]:  # Limit to first 50
                     for cls in class_attr.split():
@@ -1310,47 +2082,14 @@ class EvernoteToNextcloudConverter:
                     print(f"    Found relevant CSS classes: {sorted(list(unique_classes))[:10]}")
                 
                 # Diagnostic: Show what id names exist
-                id_matches = re.findall(r'id=["\']([^"\']*)["\']', html_content, re.IGNORECASE)
+                id_matches = _HTML_ID_ATTR_RE.findall(html_content)
                 relevant_ids = [id_name for id_name in id_matches if any(keyword in id_name.lower() for keyword in ['recipe', 'content', 'main', 'article'])]
                 if relevant_ids:
                     print(f"    Found relevant IDs: {relevant_ids[:10]}")
             
-            # Enhanced SeriousEats-specific patterns prioritizing structured data first
-            seriouseats_selectors = [
-                # PRIORITY 1: Look for structured data with microdata - this is most likely where the recipe is
-                r'<div[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<section[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</section>',
-                r'<article[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</article>',
-                r'<div[^>]*itemscope[^>]*itemtype=["\'][^"\']*Recipe[^"\']*["\'][^>]*>(.*?)</div>',
-                
-                # PRIORITY 2: SeriousEats specific class patterns - look for recipe content areas
-                r'<div[^>]*class=["\'][^"\']*recipe-summary[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<div[^>]*class=["\'][^"\']*recipe-procedure[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<div[^>]*class=["\'][^"\']*recipe-ingredients[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<section[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</section>',
-                r'<article[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</article>',
-                
-                # PRIORITY 3: More specific content containers
-                r'<div[^>]*class=["\'][^"\']*entry-content[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<div[^>]*class=["\'][^"\']*post-content[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<div[^>]*class=["\'][^"\']*recipe-content[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<main[^>]*id=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</main>',
-                
-                # PRIORITY 4: Generic recipe patterns
-                r'<div[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<article[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</article>',
-                r'<section[^>]*class=["\'][^"\']*recipe[^"\']*["\'][^>]*>(.*?)</section>',
-                
-                # PRIORITY 5: Broader content areas (these might pick up navigation, so try them last)
-                r'<main[^>]*>(.*?)</main>',
-                r'<article[^>]*>(.*?)</article>',
-                r'<div[^>]*id=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<div[^>]*id=["\'][^"\']*main[^"\']*["\'][^>]*>(.*?)</div>',
-                r'<div[^>]*class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>',
-            ]
-            
-            for i, selector in enumerate(seriouseats_selectors):
-                matches = re.findall(selector, html_content, re.DOTALL | re.IGNORECASE)
+            html_lower = html_content.lower()
+            for i, (marker, selector) in enumerate(_HTML_CONTENT_SELECTORS):
+                matches = selector.findall(html_content) if marker in html_lower else []
                 if matches:
                     if self.debug:
                         print(f"    Found HTML content with selector {i+1}: {len(matches)} matches")
@@ -1411,29 +2150,9 @@ class EvernoteToNextcloudConverter:
                     item_type = item.get('@type', 'unknown')
                     print(f"    Checking item with @type: {item_type}")
                 
-                # Check direct @type
-                if item.get('@type') == 'Recipe':
-                    recipe_obj = item
+                recipe_obj = self._extract_recipe_from_json_item(item)
+                if recipe_obj:
                     break
-                
-                # Check if @type is an array containing 'Recipe'
-                item_type = item.get('@type', [])
-                if isinstance(item_type, list) and 'Recipe' in item_type:
-                    recipe_obj = item
-                    break
-                
-                # Check nested @graph property (common in some implementations)
-                if '@graph' in item:
-                    graph_items = item['@graph']
-                    if isinstance(graph_items, list):
-                        for graph_item in graph_items:
-                            if isinstance(graph_item, dict):
-                                graph_type = graph_item.get('@type')
-                                if graph_type == 'Recipe' or (isinstance(graph_type, list) and 'Recipe' in graph_type):
-                                    recipe_obj = graph_item
-                                    break
-                    if recipe_obj:
-                        break
             
             if not recipe_obj:
                 if self.debug:
@@ -1502,9 +2221,10 @@ class EvernoteToNextcloudConverter:
                             text = instruction
                         
                         if text:
-                            # Clean up the text
-                            text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-                            text = html.unescape(text)  # Decode HTML entities
+                            # Clean up the text, most steps are plain text already
+                            if '<' in text:
+                                text = _ANY_TAG_RE.sub('', text)  # Remove HTML tags
+                            text = html.unescape(text)  # Decode HTML entities, returns at once without '&'
                             recipe_parts.append(f"{i}. {text.strip()}")
             
             # Add nutrition info if available
@@ -1542,8 +2262,8 @@ class EvernoteToNextcloudConverter:
         # Handle ISO 8601 format like PT15M, PT1H30M
         if duration_str.startswith('PT'):
             duration_str = duration_str[2:]  # Remove PT
-            hours = re.search(r'(\d+)H', duration_str)
-            minutes = re.search(r'(\d+)M', duration_str)
+            hours = _DURATION_HOURS_RE.search(duration_str)
+            minutes = _DURATION_MINUTES_RE.search(duration_str)
             
             parts = []
             if hours:
@@ -1558,93 +2278,102 @@ class EvernoteToNextcloudConverter:
     def html_to_text(self, html_content: str) -> str:
         """Convert HTML content to plain text"""
         # Remove script and style elements
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
+        html_content = _SCRIPT_STYLE_RE.sub('', html_content)
         
         # Convert common HTML elements to text
-        html_content = re.sub(r'<br[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<p[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</p>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<div[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</div>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<li[^>]*>', '\n• ', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</li>', '', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<h[1-6][^>]*>', '\n## ', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</h[1-6]>', '\n', html_content, flags=re.IGNORECASE)
+        html_content = _HTML_BLOCK_TAG_RE.sub('\n', html_content)
+        html_content = _HTML_LIST_ITEM_RE.sub('\n• ', html_content)
+        html_content = _HTML_LIST_ITEM_CLOSE_RE.sub('', html_content)
+        html_content = _HTML_HEADING_RE.sub('\n## ', html_content)
         
         # Remove all remaining HTML tags
-        html_content = re.sub(r'<[^>]+>', '', html_content)
+        html_content = _ANY_TAG_RE.sub('', html_content)
         
         # Decode HTML entities
         html_content = html.unescape(html_content)
         
         # Clean up whitespace
-        html_content = re.sub(r'\n\s*\n', '\n\n', html_content)
-        html_content = re.sub(r'[ \t]+', ' ', html_content)
+        html_content = _BLANK_LINES_RE.sub('\n\n', html_content)
+        html_content = _INLINE_WS_RE.sub(' ', html_content)
         
         return html_content.strip()
     
+    def html_to_text_prefix(self, html_content: str, length: int) -> str:
+        """Convert just enough of a page to HTML-free text that its first `length` characters are final"""
+        cut = _TEXT_PREFIX_CHUNK
+        while cut < len(html_content):
+            # Cut before a tag, and never inside a script or style element whose contents would leak into the text
+            boundary = html_content.rfind('<', 0, cut)
+            if boundary < 0:
+                boundary = cut
+            head = html_content[:boundary].lower()
+            for tag in ('script', 'style'):
+                opened = head.rfind(f'<{tag}')
+                if opened > head.rfind(f'</{tag}'):
+                    boundary = min(boundary, opened)
+            text = self.html_to_text(html_content[:boundary])
+            if len(text) >= length + _TEXT_PREFIX_MARGIN:
+                return text
+            cut *= 4
+        return self.html_to_text(html_content)
+    
     def extract_recipe_text_patterns(self, html_content: str) -> Optional[str]:
         """Extract recipe using common text patterns"""
+        debug = self.debug
         # Convert to text first
         text_content = self.html_to_text(html_content)
         
-        if self.debug:
+        if debug:
             print(f"    Full HTML-to-text conversion: {len(text_content)} characters")
             print(f"    Text preview: {text_content[:300]}...")
         
-        # Look for recipe keywords
-        recipe_keywords = [
-            r'ingredients?:?\s*\n',
-            r'directions?:?\s*\n',
-            r'instructions?:?\s*\n',
-            r'method:?\s*\n',
-            r'preparation:?\s*\n'
-        ]
-        
         # Find recipe sections
-        for keyword in recipe_keywords:
-            if re.search(keyword, text_content, re.IGNORECASE):
-                if self.debug:
-                    print(f"    Found recipe keyword: {keyword}")
-                # Found recipe content
-                return text_content
+        keyword = _RECIPE_SECTION_KEYWORD_RE.search(text_content)
+        if keyword:
+            if debug:
+                print(f"    Found recipe keyword: {keyword.group().strip()}")
+            # Found recipe content
+            return text_content
         
         # If no clear recipe structure, check for measurement patterns
-        measurement_patterns = [
-            r'\d+\s*(cups?|tablespoons?|teaspoons?|pounds?|ounces?)',
-            r'\d+/\d+\s*(cups?|tablespoons?|teaspoons?)',
-            r'[¼½¾⅓⅔⅛⅜⅝⅞]\s*(cups?|tablespoons?|teaspoons?)'
-        ]
-        
         measurement_count = 0
-        for pattern in measurement_patterns:
-            matches = re.findall(pattern, text_content, re.IGNORECASE)
-            measurement_count += len(matches)
-            if self.debug and matches:
-                print(f"    Found {len(matches)} matches for pattern: {pattern}")
+        for pattern in _TEXT_MEASUREMENT_RES:
+            if debug:
+                matches = pattern.findall(text_content)
+                measurement_count += len(matches)
+                if matches:
+                    print(f"    Found {len(matches)} matches for pattern: {pattern.pattern}")
+                continue
+            # Only the threshold matters, so stop counting once it is reached
+            for _ in pattern.finditer(text_content):
+                measurement_count += 1
+                if measurement_count >= 3:
+                    break
+            if measurement_count >= 3:
+                break
         
-        if self.debug:
+        if debug:
             print(f"    Total measurement patterns found: {measurement_count}")
         
         # If we found several measurements, it's likely a recipe
         if measurement_count >= 3:
-            if self.debug:
+            if debug:
                 print(f"    Accepting content based on measurement count")
             return text_content
         
         # For SeriousEats specifically, be more lenient - if we have substantial content, use it
         if len(text_content.strip()) > 500:
-            if self.debug:
+            if debug:
                 print(f"    Using full content as fallback (substantial length: {len(text_content)} chars)")
             return text_content
         
-        if self.debug:
+        if debug:
             print(f"    No recipe content patterns found")
         return None
 
     def validate_web_recipe_content(self, web_content: str, recipe_title: str, source_url: str) -> bool:
         """Validate that web content is actually recipe-related and not a homepage redirect"""
+        debug = self.debug
         if not web_content:
             return False
         
@@ -1652,7 +2381,7 @@ class EvernoteToNextcloudConverter:
             # Convert to text for analysis
             text_content = self.html_to_text(web_content)
             
-            if self.debug:
+            if debug:
                 print(f"    Validating web content for recipe relevance...")
             
             # Check 1: Look for obvious homepage/redirect indicators
@@ -1670,30 +2399,22 @@ class EvernoteToNextcloudConverter:
             for indicator in homepage_indicators:
                 if indicator in text_lower:
                     homepage_count += 1
-                    if self.debug:
+                    if debug:
                         print(f"      Found homepage indicator: '{indicator}'")
             
             # If we find too many homepage indicators, it's likely not a recipe page
             if homepage_count >= 3:
-                if self.debug:
+                if debug:
                     print(f"      FAILED: Too many homepage indicators ({homepage_count})")
                 return False
             
             # Check 2: Recipe-specific validation
             # Look for recipe measurements (strong positive indicator)
-            measurement_patterns = [
-                r'\d+\s*(cups?|tablespoons?|teaspoons?|pounds?|ounces?|grams?)',
-                r'\d+/\d+\s*(cups?|tablespoons?|teaspoons?)',
-                r'[¼½¾⅓⅔⅛⅜⅝⅞]\s*(cups?|tablespoons?|teaspoons?)',
-                r'\d+\s*(tbsp|tsp|oz|lb|g|kg|ml|l)\b'
-            ]
-            
             measurement_count = 0
-            for pattern in measurement_patterns:
-                matches = re.findall(pattern, text_lower, re.IGNORECASE)
-                measurement_count += len(matches)
+            for pattern in _PAGE_MEASUREMENT_RES:
+                measurement_count += len(pattern.findall(text_lower))
             
-            if self.debug:
+            if debug:
                 print(f"      Measurement count: {measurement_count}")
             
             # Check 3: Recipe title relevance
@@ -1702,7 +2423,7 @@ class EvernoteToNextcloudConverter:
             if recipe_title:
                 # Extract meaningful words from the recipe title (ignore common words)
                 common_words = {'recipe', 'the', 'a', 'an', 'and', 'or', 'with', 'for', 'in', 'on', 'at', 'to', 'from'}
-                clean_title = re.sub(r'[^\w\s]', '', recipe_title.lower())
+                clean_title = _NON_WORD_CHARS_RE.sub('', recipe_title.lower())
                 for word in clean_title.split():
                     if len(word) > 2 and word not in common_words:
                         title_words.append(word)
@@ -1711,31 +2432,23 @@ class EvernoteToNextcloudConverter:
                 for word in title_words:
                     if word in text_lower:
                         title_relevance += 1
-                        if self.debug:
+                        if debug:
                             print(f"      Found title word '{word}' in content")
             
-            if self.debug:
+            if debug:
                 print(f"      Title relevance: {title_relevance}/{len(title_words)}")
             
             # Check 4: Cooking action words
-            cooking_actions = [
-                'bake', 'cook', 'heat', 'mix', 'stir', 'add', 'pour', 'combine',
-                'blend', 'whisk', 'fold', 'beat', 'chop', 'dice', 'slice',
-                'preheat', 'serve', 'garnish', 'season', 'simmer', 'boil'
-            ]
+            cooking_action_count = len(_PAGE_COOKING_ACTIONS_RE.findall(text_lower))
             
-            cooking_action_count = 0
-            for action in cooking_actions:
-                cooking_action_count += len(re.findall(r'\b' + re.escape(action) + r'\b', text_lower))
-            
-            if self.debug:
+            if debug:
                 print(f"      Cooking action count: {cooking_action_count}")
             
             # Check 5: Content length and structure
             content_length = len(text_lower.strip())
             line_count = len([line for line in text_lower.split('\n') if line.strip()])
             
-            if self.debug:
+            if debug:
                 print(f"      Content length: {content_length}, Lines: {line_count}")
             
             # Decision logic: Content is valid if it has recipe characteristics
@@ -1780,20 +2493,20 @@ class EvernoteToNextcloudConverter:
                     if validation_score <= 0:
                         validation_score -= 1  # Penalty for URL/content mismatch
             
-            if self.debug:
+            if debug:
                 print(f"      Final validation score: {validation_score}")
                 print(f"      URL suggests recipe: {url_suggests_recipe}")
             
             # Content is valid if it scores positively
             is_valid = validation_score >= 2
             
-            if self.debug:
+            if debug:
                 print(f"      Web content validation: {'PASSED' if is_valid else 'FAILED'}")
             
             return is_valid
             
         except Exception as e:
-            if self.debug:
+            if debug:
                 print(f"      Error validating web content: {e}")
             return False
 
@@ -1805,34 +2518,20 @@ class EvernoteToNextcloudConverter:
         # Decode HTML entities
         content = html.unescape(content)
         
-        # Remove ENML wrapper
-        content = re.sub(r'<\?xml[^>]*\?>', '', content)
-        content = re.sub(r'<!DOCTYPE[^>]*>', '', content)
-        content = re.sub(r'<en-note[^>]*>', '', content)
-        content = re.sub(r'</en-note>', '', content)
-        
-        # Handle checkboxes and convert to unicode
-        content = re.sub(r'<en-todo[^>]*checked="true"[^>]*>', '✓ ', content)
-        content = re.sub(r'<en-todo[^>]*>', '☐ ', content)
-        
-        # Convert line breaks and divs to newlines
-        content = re.sub(r'<br[^>]*>', '\n', content)
-        content = re.sub(r'<div[^>]*>', '\n', content)
-        content = re.sub(r'</div>', '', content)
-        
-        # Remove remaining HTML tags
-        content = re.sub(r'<[^>]+>', '\n', content)
+        # Strip the ENML wrapper, convert checkboxes to unicode and other tags to newlines
+        content = _replace_enml_tags(content)
         
         # Clean up whitespace
-        content = re.sub(r'\n+', '\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
-        content = re.sub(r'^\s+|\s+$', '', content, flags=re.MULTILINE)
+        content = _MULTI_NEWLINE_RE.sub('\n', content)
+        content = _INLINE_WS_RE.sub(' ', content)
+        content = _LINE_TRIM_RE.sub('', content)
         
         return content.strip()
 
     def extract_source_url(self, content: str, recipe_title: str = "", note: Optional[ET.Element] = None) -> str:
         """Extract potential recipe source URL from content and note attributes"""
-        if self.debug:
+        debug = self.debug
+        if debug:
             if content:
                 print(f"    Processing content length: {len(content)}")
                 print(f"    Content preview: {content[:200]}...")
@@ -1846,74 +2545,76 @@ class EvernoteToNextcloudConverter:
                 source_url_elem = note_attributes.find('source-url')
                 if source_url_elem is not None and source_url_elem.text:
                     source_url = source_url_elem.text.strip()
-                    if self.debug:
+                    if debug:
                         print(f"    Found source-url in note-attributes: {source_url}")
                     
                     # Clean the source URL from note attributes
                     original_url = source_url
-                    while source_url.endswith(';') or source_url.endswith('/'):
-                        if source_url.endswith(';'):
-                            source_url = source_url[:-1]  # Remove trailing semicolon
-                        if source_url.endswith('/'):
-                            source_url = source_url[:-1]  # Remove trailing slash
+                    source_url = source_url.rstrip(';/')  # Remove trailing semicolons and slashes
                     
-                    if self.debug and original_url != source_url:
+                    if debug and original_url != source_url:
                         print(f"    Cleaned note-attributes source URL: '{original_url}' -> '{source_url}'")
                     
                     # Validate it's a proper HTTP URL before returning
                     if source_url.startswith(('http://', 'https://')):
-                        if self.debug:
+                        if debug:
                             print(f"    Using note-attributes source-url as highest priority")
                         return source_url
                     else:
-                        if self.debug:
+                        if debug:
                             print(f"    Note-attributes source-url is not a valid HTTP URL, continuing to other methods")
         
         if not content:
             return ""
         
-        # PRIORITY 2: Look for explicit source URL tags in content
-        source_url_patterns = [
-            r'<source-url>\s*(https?://[^<>"\']+)\s*</source-url>',  # <source-url>...</source-url>
-            r'--en-clipped-source-url:\s*(https?://[^\s<>"\']+)'     # Evernote clipped URLs
-        ]
+        # Debug runs score every note so each one prints its URL candidates
+        if debug:
+            return self.extract_content_source_url(content, recipe_title)
+        return self._cached_content_source_url(content, recipe_title)
+
+    def _cached_content_source_url(self, content: str, recipe_title: str) -> str:
+        """Pick the note content's source URL, reusing the result for a body and title seen earlier in this run"""
+        key = (hashlib.blake2b(content.encode(), digest_size=16).digest(), recipe_title)
+        with self._content_source_urls_lock:
+            source_url = self._content_source_urls.get(key)
+            if source_url is not None:
+                self._content_source_urls.move_to_end(key)
+                return source_url
+        
+        source_url = self.extract_content_source_url(content, recipe_title)
+        with self._content_source_urls_lock:
+            self._content_source_urls[key] = source_url
+            if len(self._content_source_urls) > _SOURCE_URL_CACHE_SIZE:
+                self._content_source_urls.popitem(last=False)
+        return source_url
+
+    def extract_content_source_url(self, content: str, recipe_title: str = "") -> str:
+        """Pick the most likely recipe source URL among the URLs in the note content"""
+        debug = self.debug
         
-        for pattern in source_url_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        # PRIORITY 2: Look for explicit source URL tags in content
+        for pattern in _EXPLICIT_SOURCE_URL_RES:
+            matches = pattern.findall(content)
             if matches:
-                if self.debug:
+                if debug:
                     print(f"    Found explicit source URL(s) in content: {matches}")
                 # Clean the explicit source URL too
                 explicit_url = matches[0]
                 original_url = explicit_url
                 
                 # Apply the same cleaning logic to explicit URLs
-                while explicit_url.endswith(';') or explicit_url.endswith('/'):
-                    if explicit_url.endswith(';'):
-                        explicit_url = explicit_url[:-1]  # Remove trailing semicolon
-                    if explicit_url.endswith('/'):
-                        explicit_url = explicit_url[:-1]  # Remove trailing slash
+                explicit_url = explicit_url.rstrip(';/')  # Remove trailing semicolons and slashes
                 
-                if self.debug and original_url != explicit_url:
+                if debug and original_url != explicit_url:
                     print(f"    Cleaned explicit source URL: '{original_url}' -> '{explicit_url}'")
                 
                 # Return the first (usually only) explicit source URL
                 return explicit_url
         
         # PRIORITY 2: Look for other URL patterns - stop only at sentence-ending punctuation
-        url_patterns = [
-            # Standard URL pattern - stop at whitespace, quotes, or sentence-ending punctuation
-            r'https?://[^\s<>"\']+',
-            # More specific pattern for common recipe sites
-            r'https?://(?:www\.)?[\w\-]+\.com[^\s<>"\']*',
-            # SeriousEats specific
-            r'https?://(?:www\.)?seriouseats\.com[^\s<>"\']*',
-        ]
-        
         all_urls = []
-        for pattern in url_patterns:
-            urls = re.findall(pattern, content)
-            all_urls.extend(urls)
+        for pattern in _CONTENT_URL_RES:
+            all_urls.extend(pattern.findall(content))
         
         # Remove duplicates while preserving order
         urls = []
@@ -1925,49 +2626,18 @@ class EvernoteToNextcloudConverter:
         
         # Filter out invalid URLs
         valid_urls = []
-        invalid_patterns = [
-            r'\.dtd',  # XML DTD files
-            r'\.xsd',  # XML Schema files
-            r'\.xml',  # Generic XML files
-            r'evernote\.com',  # Evernote URLs
-            r'xml\..*\.com',  # XML-related domains
-            r'xmlns\.',  # XML namespace URLs
-            r'w3\.org',  # W3C specification URLs
-            r'example\.com',  # Example/placeholder URLs
-            r'localhost',  # Local URLs
-            r'127\.0\.0\.1',  # Local IP
-            r'\.css',  # CSS files
-            r'\.js',  # JavaScript files
-            r'\.png',  # Image files
-            r'\.jpg',  # Image files
-            r'\.gif',  # Image files
-            r'facebook\.com',  # Social media
-            r'twitter\.com',  # Social media
-            r'instagram\.com',  # Social media
-            r'pinterest\.com',  # Social media
-            r'linkedin\.com',  # Social media
-            r'youtube\.com',  # Video sharing
-            r'youtu\.be',  # Video sharing short links
-            r'api\.whatsapp\.com',  # WhatsApp sharing URLs
-            r'wa\.me',  # WhatsApp short links
-            r't\.co',  # Twitter short links
-            r'bit\.ly',  # Bitly short links
-            r'tinyurl\.com',  # TinyURL short links
-            r'mailto:',  # Email links
-        ]
         
         for url in urls:
             url_lower = url.lower()
             # Skip URLs that match invalid patterns
-            if any(re.search(pattern, url_lower) for pattern in invalid_patterns):
-                if self.debug:
+            if _INVALID_SOURCE_URL_RE.search(url_lower):
+                if debug:
                     print(f"    Skipping invalid URL: {url}")
                 continue
             
             # Skip URLs with sharing/tracking parameters that make them look like sharing URLs
-            sharing_params = ['text=', 'url=', 'smid=', 'utm_source=', 'utm_medium=']
-            if any(param in url_lower for param in sharing_params):
-                if self.debug:
+            if any(param in url_lower for param in _SHARING_URL_PARAMS):
+                if debug:
                     print(f"    Skipping sharing URL: {url}")
                 continue
             
@@ -1981,71 +2651,53 @@ class EvernoteToNextcloudConverter:
             
             # Clean up URLs with unwanted suffixes
             clean_url = self.clean_recipe_url(url)
-            if clean_url != url and self.debug:
+            if clean_url != url and debug:
                 print(f"    Cleaned URL: {url} -> {clean_url}")
             
             valid_urls.append(clean_url)
         
         if not valid_urls:
-            if self.debug:
+            if debug:
                 print("    No valid URLs found")
             return ""
         
-        if self.debug:
+        if debug:
             print(f"    Found valid URLs: {valid_urls}")
         
         # Score URLs based on how likely they are to be recipe sources
-        recipe_keywords = [
-            'recipe', 'food', 'cooking', 'kitchen', 'chef', 'cuisine', 'dish',
-            'allrecipes', 'foodnetwork', 'epicurious', 'bonappetit', 'seriouseats',
-            'tasteofhome', 'delish', 'food52', 'yummly', 'budget', 'meal',
-            'ingredient', 'bake', 'cook', 'serious', 'eats', 'blog', 'soup',
-            'midwest', 'foodie', 'vegan', 'lentil', 'tortilla'
-        ]
-        
         # Extract words from recipe title for URL matching
-        title_words = []
+        title_words = frozenset()
         if recipe_title:
-            # Clean and split title into words
-            clean_title = re.sub(r'[^\w\s-]', '', recipe_title.lower())
-            title_words = [word.strip() for word in clean_title.split() if len(word) > 2]
-            if self.debug:
-                print(f"    Recipe title words for URL matching: {title_words}")
+            # Split title into words, ignoring punctuation
+            title_words = frozenset(word for word in _WORD_TOKEN_RE.findall(recipe_title.lower()) if len(word) > 2)
+            if debug:
+                print(f"    Recipe title words for URL matching: {sorted(title_words)}")
         
         scored_urls = []
         for url in valid_urls:
             score = 1  # Start with base score of 1 for any valid URL
             url_lower = url.lower()
             
-            # HIGHEST PRIORITY: Boost score significantly if title words appear in URL
-            title_word_matches = 0
-            for word in title_words:
-                if word in url_lower:
-                    title_word_matches += 1
-                    score += 5  # Strong boost for each title word match
+            # HIGHEST PRIORITY: Boost score significantly if title words appear in URL as whole words
+            title_word_matches = len(title_words & set(_WORD_TOKEN_RE.findall(url_lower))) if title_words else 0
+            score += 5 * title_word_matches  # Strong boost for each title word match
             
-            if title_word_matches > 0 and self.debug:
+            if title_word_matches > 0 and debug:
                 print(f"    Title word matches in URL: {title_word_matches} words")
             
             # PENALTY: Heavily penalize URLs with unwanted segments (even after cleaning)
-            unwanted_url_parts = [
-                '/print', '/comment', '/respond', '/feed', '/rss', '/trackback',
-                '/amp', '/mobile', 'facebook.com', 'twitter.com', 'instagram.com',
-                'pinterest.com', 'linkedin.com', 'youtube.com', 'youtu.be'
-            ]
-            
             penalty_count = 0
-            for unwanted in unwanted_url_parts:
+            for unwanted in _UNWANTED_URL_PARTS:
                 if unwanted in url_lower:
                     penalty_count += 1
                     score -= 10  # Heavy penalty for unwanted segments
             
-            if penalty_count > 0 and self.debug:
+            if penalty_count > 0 and debug:
                 print(f"    URL penalty for unwanted segments: -{penalty_count * 10}")
             
             # BONUS: Prefer shorter, cleaner URLs (main recipe pages)
             # Count path segments - fewer is usually better for recipe pages
-            path_segments = url.replace('https://', '').replace('http://', '').count('/')
+            path_segments = url.count('/') - (2 if url.startswith(('http://', 'https://')) else 0)
             if path_segments <= 2:  # domain.com/recipe-name
                 score += 3
             elif path_segments == 3:  # domain.com/category/recipe-name
@@ -2054,15 +2706,12 @@ class EvernoteToNextcloudConverter:
                 score -= 2
             
             # Higher score for recipe-related domains/paths
-            for keyword in recipe_keywords:
+            for keyword in _RECIPE_URL_KEYWORDS:
                 if keyword in url_lower:
                     score += 2
             
             # Boost score for common recipe sites
-            if any(site in url_lower for site in ['allrecipes.com', 'foodnetwork.com', 
-                                                  'epicurious.com', 'bonappetit.com',
-                                                  'seriouseats.com', 'food52.com', 
-                                                  'tasteofhome.com']):
+            if any(site in url_lower for site in _RECIPE_SITES):
                 score += 5
             
             # Extra boost for SeriousEats specifically
@@ -2070,51 +2719,44 @@ class EvernoteToNextcloudConverter:
                 score += 3
             
             # Boost for food blogs (common pattern)
-            if any(pattern in url_lower for pattern in ['foodie', 'blog', 'kitchen', 'recipe']):
+            if any(pattern in url_lower for pattern in _FOOD_BLOG_MARKERS):
                 score += 3
             
             # Boost for recipe-like paths containing dish names or ingredients
-            recipe_path_indicators = [
-                'soup', 'salad', 'chicken', 'beef', 'pasta', 'bread', 'cake', 
-                'cookie', 'vegan', 'vegetarian', 'healthy', 'easy', 'quick'
-            ]
-            for indicator in recipe_path_indicators:
+            for indicator in _RECIPE_PATH_INDICATORS:
                 if indicator in url_lower:
                     score += 1
             
             # Penalize very long URLs or those with tracking parameters
-            if len(url) > 150 or any(param in url_lower for param in ['utm_', 'ref=', 'src=']):
+            if len(url) > 150 or any(param in url_lower for param in _TRACKING_PARAMS):
                 score -= 1
             
             scored_urls.append((score, url))
-            if self.debug:
+            if debug:
                 print(f"    URL: {url[:70]}... Score: {score} (title matches: {title_word_matches}, penalties: {penalty_count})")
         
-        # Sort by score descending, then by URL length ascending (prefer shorter URLs when scores are equal)
-        scored_urls.sort(key=lambda x: (-x[0], len(x[1])))
+        # Rank by score descending, then by URL length ascending (prefer shorter URLs when scores are equal)
+        # Only the best URL (plus two alternatives for debug output) is needed, so skip the full sort
+        top_urls = heapq.nlargest(3 if debug else 1, scored_urls, key=lambda x: (x[0], -len(x[1])))
         
         # Return the highest scoring URL, or first URL if no good matches
-        if scored_urls:
-            best_url = scored_urls[0][1]
+        if top_urls:
+            best_url = top_urls[0][1]
             
             # Clean up the URL - only remove trailing semicolons and /;
             original_best_url = best_url
             
             # Loop through and remove trailing ; and / until none remain
-            while best_url.endswith(';') or best_url.endswith('/'):
-                if best_url.endswith(';'):
-                    best_url = best_url[:-1]  # Remove trailing semicolon
-                if best_url.endswith('/'):
-                    best_url = best_url[:-1]  # Remove trailing slash
+            best_url = best_url.rstrip(';/')  # Remove trailing semicolons and slashes
             
-            if self.debug and original_best_url != best_url:
+            if debug and original_best_url != best_url:
                 print(f"    URL punctuation cleaned: '{original_best_url}' -> '{best_url}'")
             
-            if self.debug:
+            if debug:
                 print(f"    Selected URL: {best_url}")
                 if len(scored_urls) > 1:
                     print(f"    Other candidates:")
-                    for score, candidate_url in scored_urls[1:3]:  # Show top 3 alternatives
+                    for score, candidate_url in top_urls[1:3]:  # Show top 3 alternatives
                         print(f"      Score {score}: {candidate_url}")
             return best_url
         
@@ -2122,11 +2764,13 @@ class EvernoteToNextcloudConverter:
 
     def extract_ingredients(self, content: str, recipe_title: str = "Unknown Recipe") -> List[str]:
         """Extract ingredients from content"""
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        debug = self.debug
+        lines = [line for line in map(str.strip, content.split('\n')) if line]
+        lines_lower = [line.lower() for line in lines]
         ingredients = []
         substitution_notes = []
         
-        if self.debug:
+        if debug:
             print(f"\n{'#'*80}")
             print(f"# INGREDIENT EXTRACTION - {recipe_title}")
             print(f"{'#'*80}")
@@ -2139,74 +2783,70 @@ class EvernoteToNextcloudConverter:
             print("=" * 50)
         
         # First pass: collect substitution notes
-        for line in lines:
-            if self.is_substitution_note(line):
-                substitution_notes.append(line)
+        for line, line_lower in zip(lines, lines_lower):
+            if self.is_substitution_note(line, line_lower):
+                substitution_notes.append((line, line_lower))
+        
+        # Precompute the key food words mentioned by each substitution note
+        note_food_sets = [(note, frozenset(word for word in _FOOD_WORDS if word in note_lower))
+                          for note, note_lower in substitution_notes]
+        
+        # Run the URL/page/serving/time filters once per line; all passes below reuse the result
+        skip_reasons = [self._line_skip_reason(line_lower) for line_lower in lines_lower]
         
         # Look for ingredient section
         in_ingredients_section = False
         
-        for line in lines:
-            # Skip URLs completely
-            if any(url_part in line.lower() for url_part in ['http', 'www.', '.com', '.org']):
-                continue
-                
-            # Skip page numbers and references
-            if re.search(r'\bpage\s+\d+\b|\bp\.\s*\d+\b', line.lower()):
-                continue
-                
-            # Skip serving/yield info
-            if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line.lower()):
-                continue
-                
-            # Skip time information
-            if re.search(r'\b(prep|cook|total)\s+time\b|\b\d+\s+(min|minutes|hrs?|hours?)\b', line.lower()):
+        for line, line_lower, skip_reason in zip(lines, lines_lower, skip_reasons):
+            # Skip URLs, page references, serving/yield and time information
+            if skip_reason:
                 continue
             
             # Check for ingredient section headers
-            if re.search(r'\b(ingredient|材料)\b', line.lower()):
+            if _prefiltered_search(_INGREDIENT_HEADER_RE, _INGREDIENT_HEADER_LITERALS, line_lower):
                 in_ingredients_section = True
                 continue
                 
             # Check for instruction section headers (stop ingredient detection)
-            if re.search(r'\b(instruction|direction|method|step|作り方|手順)\b', line.lower()):
+            if _prefiltered_search(_INSTRUCTION_HEADER_RE, _INSTRUCTION_HEADER_LITERALS, line_lower):
                 in_ingredients_section = False
                 continue
             
             # CRITICAL FIX: Always check is_ingredient_line() first, even if in ingredients section
-            clean_line = self.clean_ingredient_line(line)
+            clean_line = _clean_ingredient_line(line)
             if not clean_line or len(clean_line) <= 2:
-                if self.debug:
+                if debug:
                     print(f"REJECTED (too short after cleaning): '{line}' -> '{clean_line}'")
                 continue
                 
             # Apply the ingredient filtering logic - this is the key fix
-            is_ingredient = self.is_ingredient_line(clean_line)
+            is_ingredient = _is_ingredient_line(clean_line)
             
             # Enhanced logic: if we're in an ingredient section, be more lenient
             if in_ingredients_section and not is_ingredient:
+                clean_lower = clean_line.lower()
                 # Check if it's a simple ingredient that doesn't match our patterns
                 # but is likely an ingredient based on context
                 if (len(clean_line) > 3 and len(clean_line) < 100 and
-                    not any(verb in clean_line.lower() for verb in ['heat', 'cook', 'bake', 'mix', 'stir', 'add', 'pour', 'remove']) and
-                    not clean_line.lower().startswith(('step', 'then', 'next', 'meanwhile', 'after', 'before', 'until'))):
-                    if self.debug:
+                    not any(verb in clean_lower for verb in _SECTION_CONTEXT_VERBS) and
+                    not clean_lower.startswith(_SECTION_CONTEXT_STARTERS)):
+                    if debug:
                         print(f"ACCEPTED (in ingredient section): '{clean_line}'")
-                    enhanced_ingredient = self.enhance_ingredient_with_substitutions(clean_line, substitution_notes)
+                    enhanced_ingredient = self.enhance_ingredient_with_substitutions(clean_line, note_food_sets)
                     ingredients.append(enhanced_ingredient)
-                    if self.debug:
+                    if debug:
                         print(f"ADDED INGREDIENT (pass 1 - section context): '{enhanced_ingredient}'")
                     continue
             
             if is_ingredient and len(line) < 200:  # Must pass ingredient test AND length check
                 # Try to match with substitution notes
-                enhanced_ingredient = self.enhance_ingredient_with_substitutions(clean_line, substitution_notes)
+                enhanced_ingredient = self.enhance_ingredient_with_substitutions(clean_line, note_food_sets)
                 ingredients.append(enhanced_ingredient)
-                if self.debug:
+                if debug:
                     print(f"ADDED INGREDIENT (pass 1): '{enhanced_ingredient}'")
             else:
                 # Debug why this line was rejected
-                if self.debug:
+                if debug:
                     if len(line) >= 200:
                         print(f"REJECTED (too long): '{line[:50]}...' ({len(line)} chars)")
                     else:
@@ -2214,108 +2854,46 @@ class EvernoteToNextcloudConverter:
         
         # If no ingredients found, try pattern matching on all lines
         if not ingredients:
-            if self.debug:
+            if debug:
                 print("No ingredients found in pass 1, trying pass 2...")
-            for line in lines:
+            for line, skip_reason in zip(lines, skip_reasons):
                 # Apply same filters
-                if any(url_part in line.lower() for url_part in ['http', 'www.', '.com', '.org']):
-                    continue
-                if re.search(r'\bpage\s+\d+\b|\bp\.\s*\d+\b', line.lower()):
-                    continue
-                if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line.lower()):
-                    continue
-                if re.search(r'\b(prep|cook|total)\s+time\b|\b\d+\s+(min|minutes|hrs?|hours?)\b', line.lower()):
+                if skip_reason:
                     continue
                     
-                if self.is_ingredient_line(line) and len(line) < 200:
-                    clean_line = self.clean_ingredient_line(line)
+                if _is_ingredient_line(line) and len(line) < 200:
+                    clean_line = _clean_ingredient_line(line)
                     if clean_line and len(clean_line) > 2:
-                        enhanced_ingredient = self.enhance_ingredient_with_substitutions(clean_line, substitution_notes)
+                        enhanced_ingredient = self.enhance_ingredient_with_substitutions(clean_line, note_food_sets)
                         ingredients.append(enhanced_ingredient)
-                        if self.debug:
+                        if debug:
                             print(f"ADDED INGREDIENT (pass 2): '{enhanced_ingredient}'")
         
         # If still no ingredients, use first few short lines (but apply strict filters)
         if not ingredients:
-            if self.debug:
-                print("No ingredients found in pass 2, trying pass 3 (first 10 lines)...")
-            for i, line in enumerate(lines[:10]):
-                if self.debug:
-                    print(f"  Line {i+1}: '{line[:80]}...'")
-                if any(url_part in line.lower() for url_part in ['http', 'www.', '.com', '.org']):
-                    if self.debug:
-                        print(f"    REJECTED: Contains URL")
-                    continue
-                if re.search(r'\bpage\s+\d+\b|\bp\.\s*\d+\b', line.lower()):
-                    if self.debug:
-                        print(f"    REJECTED: Contains page reference")
-                    continue
-                if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line.lower()):
-                    if self.debug:
-                        print(f"    REJECTED: Contains serving info")
-                    continue
-                if re.search(r'\b(prep|cook|total)\s+time\b|\b\d+\s+(min|minutes|hrs?|hours?)\b', line.lower()):
-                    if self.debug:
-                        print(f"    REJECTED: Contains time info")
-                    continue
-                    
-                # MUST pass the strict ingredient test - no fallback to instruction test
-                if (5 < len(line) < 150 and 
-                    self.is_ingredient_line(line)):  # Use strict ingredient test, not instruction test
-                    enhanced_ingredient = self.enhance_ingredient_with_substitutions(line, substitution_notes)
-                    ingredients.append(enhanced_ingredient)
-                    if self.debug:
-                        print(f"    ADDED INGREDIENT (pass 3): '{enhanced_ingredient}'")
-                else:
-                    if self.debug:
-                        is_ingredient = self.is_ingredient_line(line)
-                        print(f"    REJECTED: length={len(line)}, is_ingredient={is_ingredient}")
-        
-        if self.debug:
-            print(f"=== FINAL INGREDIENT COUNT: {len(ingredients)} ===")
-            for i, ing in enumerate(ingredients):
-                print(f"  {i+1}. {ing}")
-            print("=" * 50)
-            print(f"# END INGREDIENT EXTRACTION - {recipe_title}")
-            print(f"{'#'*80}")
-        
-        # If still no ingredients, use first few short lines (but apply strict filters)
-        if not ingredients:
-            if self.debug:
+            if debug:
                 print("No ingredients found in pass 2, trying pass 3 (first 10 lines)...")
-            for i, line in enumerate(lines[:10]):
-                if self.debug:
+            for i, (line, skip_reason) in enumerate(zip(lines[:10], skip_reasons)):
+                if debug:
                     print(f"  Line {i+1}: '{line[:80]}...'")
-                if any(url_part in line.lower() for url_part in ['http', 'www.', '.com', '.org']):
-                    if self.debug:
-                        print(f"    REJECTED: Contains URL")
-                    continue
-                if re.search(r'\bpage\s+\d+\b|\bp\.\s*\d+\b', line.lower()):
-                    if self.debug:
-                        print(f"    REJECTED: Contains page reference")
-                    continue
-                if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line.lower()):
-                    if self.debug:
-                        print(f"    REJECTED: Contains serving info")
-                    continue
-                if re.search(r'\b(prep|cook|total)\s+time\b|\b\d+\s+(min|minutes|hrs?|hours?)\b', line.lower()):
-                    if self.debug:
-                        print(f"    REJECTED: Contains time info")
+                if skip_reason:
+                    if debug:
+                        print(f"    REJECTED: Contains {skip_reason}")
                     continue
                     
                 # MUST pass the strict ingredient test - no fallback to instruction test
                 if (5 < len(line) < 150 and 
-                    self.is_ingredient_line(line)):  # Use strict ingredient test, not instruction test
-                    enhanced_ingredient = self.enhance_ingredient_with_substitutions(line, substitution_notes)
+                    _is_ingredient_line(line)):  # Use strict ingredient test, not instruction test
+                    enhanced_ingredient = self.enhance_ingredient_with_substitutions(line, note_food_sets)
                     ingredients.append(enhanced_ingredient)
-                    if self.debug:
+                    if debug:
                         print(f"    ADDED INGREDIENT (pass 3): '{enhanced_ingredient}'")
                 else:
-                    if self.debug:
-                        is_ingredient = self.is_ingredient_line(line)
+                    if debug:
+                        is_ingredient = _is_ingredient_line(line)
                         print(f"    REJECTED: length={len(line)}, is_ingredient={is_ingredient}")
         
-        if self.debug:
+        if debug:
             print(f"=== FINAL INGREDIENT COUNT: {len(ingredients)} ===")
             for i, ing in enumerate(ingredients):
                 print(f"  {i+1}. {ing}")
@@ -2325,217 +2903,46 @@ class EvernoteToNextcloudConverter:
         
         return ingredients[:25]  # Limit to reasonable number
 
+    def _line_skip_reason(self, line_lower: str) -> Optional[str]:
+        """Return why a line is neither ingredient nor instruction text, or None"""
+        # Skip URLs, page references, serving/yield info and time information in one scan
+        match = _SKIP_LINE_RE.search(line_lower)
+        if match:
+            return _SKIP_REASONS[match.lastgroup]
+        
+        return None
+
     def clean_ingredient_line(self, line: str) -> str:
         """Clean up an ingredient line"""
-        # Remove various bullet points and list markers
-        line = re.sub(r'^[\s]*[•\-\*\+\>\◦\▪\▫\○\●\□\■\➤\→\⁃]\s*', '', line)
-        # Remove Unicode bullet points and dashes
-        line = re.sub(r'^[\s]*[‣‧⁌⁍]\s*', '', line)
-        # Remove checkmarks and checkboxes
-        line = re.sub(r'^[\s]*[☐✓✗□✔✘]\s*', '', line)
-        # Remove leading numbers with periods/parentheses/brackets
-        line = re.sub(r'^\d+[\.\)\]]\s*', '', line)
-        # Remove leading letters with periods/parentheses
-        line = re.sub(r'^[a-zA-Z][\.\)]\s*', '', line)
-        return line.strip()
+        return _clean_ingredient_line(line)
 
     def is_ingredient_line(self, line: str) -> bool:
         """Check if line looks like an ingredient with improved filtering"""
-        if not line or len(line.strip()) < 3:
-            return False
-        
-        # Clean the line first to remove bullet points and other formatting
-        clean_line = self.clean_ingredient_line(line)
-        if not clean_line or len(clean_line.strip()) < 3:
-            return False
-        
-        line_lower = clean_line.lower()
-        
-        # EARLY CHECK: Special case for "to taste" and "salt and pepper" patterns - these are usually ingredients
-        # But ONLY if they don't start with instruction verbs AND are short standalone lines
-        first_word = line_lower.split()[0] if line_lower.split() else ""
-        instruction_starters_early = ['uncover', 'stir', 'mix', 'add', 'heat', 'cook', 'remove', 'serve', 'drain', 'transfer', 'top']
-        
-        if (re.search(r'\bto\s+taste\b', line_lower) or re.search(r'\bsalt\s+and\s+pepper\b', line_lower)):
-            # Only accept as ingredient if it's a short line that doesn't start with instruction verbs
-            if first_word not in instruction_starters_early and len(clean_line) < 50:
-                return True
-        
-        # STEP 1: Reject lines that are clearly cooking instructions (start with action verbs)
-        instruction_starters = [
-            'heat', 'cook', 'bake', 'boil', 'simmer', 'saute', 'fry', 'grill',
-            'mix', 'stir', 'whisk', 'blend', 'combine', 'add', 'pour', 'place',
-            'remove', 'drain', 'rinse', 'wash', 'chop', 'dice', 'slice', 'cut',
-            'preheat', 'serve', 'garnish', 'season', 'taste', 'adjust',
-            'make', 'prepare', 'get', 'take', 'put', 'set', 'let', 'allow',
-            'bring', 'reduce', 'increase', 'cover', 'uncover', 'flip', 'turn',
-            'grate', 'melt', 'dissolve', 'spread', 'brush', 'spray', 'oil',
-            'grease', 'line', 'transfer', 'arrange', 'top', 'fill', 'stuff'
-        ]
-        
-        # Check if line starts with an instruction verb (use cleaned line)
-        first_word = line_lower.split()[0] if line_lower.split() else ""
-        if first_word in instruction_starters:
-            return False
-        
-        # STEP 2: Reject numbered instructions (1., 2., Step 1, etc.) - but NOT ingredient quantities
-        # Only reject if number is followed by period/parenthesis/dash AND space (like "1. Mix" or "1) Heat" or "1 - Stir")
-        # NOT if it's followed by a measurement unit (like "1 cup" or "12 ounces")
-        if re.match(r'^\d+[\.\)\-]\s', clean_line) or line_lower.startswith('step'):
-            return False
-        
-        # STEP 3: Reject section headers
-        section_headers = [
-            'ingredients', 'directions', 'instructions', 'method', 'preparation',
-            'for the', 'herb blend', 'everything else', 'sauce', 'topping',
-            'marinade', 'dressing', 'garnish', 'notes', 'variations'
-        ]
-        
-        if any(line_lower.startswith(header) for header in section_headers):
-            return False
-        
-        # STEP 4: Reject lines that are clearly procedural text
-        procedural_phrases = [
-            'using', 'while', 'until', 'when', 'then', 'next', 'after',
-            'before', 'during', 'meanwhile', 'alternately', 'alternatively',
-            'if you', 'you can', 'this will', 'this is', 'repeat', 'continue',
-            'coming to', 'works pretty', 'is easier', 'my favorite', 'i find', 
-            'i like', 'and stir', 'stir them', 'into the sauce'
-        ]
-        
-        # Check for procedural phrases but be more careful about "to taste"
-        found_procedural = None
-        for phrase in procedural_phrases:
-            if phrase in line_lower:
-                found_procedural = phrase
-                break
-        
-        if found_procedural:
-            return False
-        
-        # STEP 5: Reject very long lines (likely instructions)
-        if len(line) > 200:
-            return False
-        
-        # STEP 6: Look for positive ingredient indicators
-        # Common measurement units
-        measurements = [
-            'cup', 'cups', 'tablespoon', 'tablespoons', 'tbsp', 'teaspoon', 'teaspoons', 'tsp',
-            'pound', 'pounds', 'lb', 'lbs', 'ounce', 'ounces', 'oz', 'gram', 'grams', 'g',
-            'kilogram', 'kg', 'liter', 'liters', 'ml', 'milliliter', 'quart', 'pint',
-            'gallon', 'inch', 'inches', 'can', 'cans', 'package', 'pkg', 'bottle',
-            'jar', 'box', 'bag', 'bunch', 'clove', 'cloves', 'head', 'slice', 'slices'
-        ]
-        
-        # Enhanced pattern matching for ingredients - more comprehensive patterns
-        ingredient_patterns = [
-            # CRITICAL FIX: Simple whole number + unit patterns (this was missing!)
-            r'^\s*\d+\s+(cups?|cup|tablespoons?|tbsp|tablespoon|teaspoons?|tsp|teaspoon)',  # "1 cup", "4 cups", "2 tablespoons"
-            r'^\s*\d+\s+(pounds?|lbs?|lb|ounces?|oz|ounce)',  # "1 pound", "12 ounces"
-            r'^\s*\d+\s+(grams?|g|kilograms?|kg)',  # "96 g", "1 kg"
-            r'^\s*\d+\s+(ml|milliliters?|liters?|l)',  # "235 ml", "1 liter"
-            
-            # Specific complex patterns with parentheses
-            r'^\s*\d+\s*(lbs?|pounds?|lb)\s*\(\s*\d+g?\s*\)',  # "1 lb ( 453g)"
-            r'^\s*\d+\s+\d+/\d+\s*-\s*\d+\s*(cups?|cup)\s*\(\d+-\d+\s*ml\)',  # "1 1/3-2 cups (320-473 ml)"
-            r'^\s*\d+\s*(cups?|cup)\s*\(\d+\s*g\)',  # "4 cups (400 g)"
-            r'^\s*\d+\s*(teaspoons?|tsp)\s*\(\d+\s*g\)',  # "4 teaspoons (8 g)"
-            r'^\s*\d+\s*-\s*\d+\s*\(\d+-\d+\s*g\)\s*(tablespoons?|tbsp)',  # "4-7 (15-30 g) tablespoons"
-            
-            # Decimal patterns
-            r'^\s*\d+\.\d+\s*(cups?|tablespoons?|tbsp|tablespoon|teaspoons?|tsp|teaspoon)',
-            r'^\s*\d+\.\d+\s*(pounds?|lbs?|lb|ounces?|oz|ounce)',
-            r'^\s*\d+\.\d+\s*(grams?|g|kilograms?|kg)',
-            r'^\s*\d+\.\d+\s*(ml|milliliters?|liters?|l)',
-            
-            # Container/package patterns
-            r'^\s*\d+\s+(cans?|can|jars?|jar|bottles?|bottle|packages?|pkg|package)',
-            r'^\s*\d+\s+(cloves?|clove|heads?|head|bunches?|bunch)',
-            r'^\s*\d+\s+(slices?|slice|pieces?|piece)',
-            
-            # Fraction patterns
-            r'^\s*\d+/\d+\s*(cups?|tablespoons?|tbsp|teaspoons?|tsp|pounds?|lbs?|ounces?|oz)',
-            r'^\s*\d+\s+\d+/\d+\s*(cups?|tablespoons?|tbsp|teaspoons?|tsp|pounds?|lbs?|ounces?|oz)',
-            
-            # Unicode fractions
-            r'^\s*[¼½¾⅓⅔⅛⅜⅝⅞]\s*(cups?|tablespoons?|tbsp|teaspoons?|tsp|pounds?|lbs?|ounces?|oz)',
-            
-            # NEW: Simple ingredient names without measurements (catch ingredients that don't have measurements)
-            r'^\s*[a-zA-Z][a-zA-Z\s,\-\(\)]*(?:tofu|oil|sauce|miso|chipotle|garlic|ginger|scallions?|pepper|salt|sesame|vinegar|sugar|honey|lime|lemon|soy|firm|extra|virgin|olive|vegetable|canola|peanut|rice|wine|white|red|black|ground|fresh|dried|minced|chopped|sliced)[a-zA-Z\s,\-\(\)]*$',
-            
-            # Even more lenient: any line that contains common ingredient words but no measurements
-            r'.*(?:tofu|miso|chipotle|garlic|ginger|scallions?|green onions?|soy sauce|sesame oil|rice vinegar|sugar|honey|lime|lemon|oil|sauce|pepper|salt).*',
-            
-            # Simple number + any word (catch-all for items like "2 eggs", "3 apples")
-            r'^\s*\d+\s+[a-zA-Z]+',  # "2 teaspoons", "12 ounces", etc.
-        ]
-        
-        # Check enhanced patterns first (use cleaned line)
-        for pattern in ingredient_patterns:
-            if re.match(pattern, clean_line, re.IGNORECASE):
-                return True
-        
-        # Check if line contains measurements (strong indicator of ingredient)
-        has_measurement = any(re.search(r'^\s*\d+.*?\b' + re.escape(measure) + r'\b', line_lower) or
-          re.search(r'^\s*[¼½¾⅓⅔⅛⅜⅝⅞].*?\b' + re.escape(measure) + r'\b', line_lower)
-          for measure in measurements)
-        
-        # Check for fraction patterns (1/2, 3/4, etc.) - must be at start of line
-        has_fraction = re.search(r'^\s*\d+/\d+', line)
-        
-        # Check for number at start (quantity indicator) - use cleaned line
-        starts_with_number = re.match(r'^\s*\d+', clean_line)
-        
-        # Must have at least one positive indicator
-        if not (has_measurement or has_fraction or starts_with_number):
-            return False
-        
-        # STEP 8: Additional checks for common ingredient patterns
-        # Reject if it contains too many instruction-like words
-        instruction_words = [
-            'until', 'then', 'and stir', 'and mix', 'and add', 'and pour',
-            'according to', 'as needed', 'or more', 'if needed', 'coming to',
-            'works pretty', 'is easier', 'my favorite', 'i find', 'i like'
-        ]
-        
-        instruction_word_count = sum(1 for word in instruction_words if word in line_lower)
-        if instruction_word_count > 1:  # More than 1 instruction word = likely instruction
-            return False
-        
-        return True
+        return _is_ingredient_line(line)
 
-    def is_substitution_note(self, line: str) -> bool:
+    def is_substitution_note(self, line: str, line_lower: Optional[str] = None) -> bool:
         """Check if line is a substitution note that should be associated with an ingredient"""
-        line_lower = line.lower()
-        
-        substitution_indicators = [
-            'you can replace', 'can replace', 'replace', 'substitute', 
-            'try replacing', 'instead of', 'alternative', 'or use',
-            'can substitute', 'can use', 'use instead'
-        ]
-        
-        return any(indicator in line_lower for indicator in substitution_indicators)
+        if line_lower is None:
+            line_lower = line.lower()
+        return any(indicator in line_lower for indicator in _SUBSTITUTION_INDICATORS)
 
-    def enhance_ingredient_with_substitutions(self, ingredient: str, substitution_notes: List[str]) -> str:
+    def enhance_ingredient_with_substitutions(self, ingredient: str,
+                                              note_food_sets: List[Tuple[str, FrozenSet[str]]]) -> str:
         """Try to match substitution notes with ingredients and append them"""
         ingredient_lower = ingredient.lower()
         
         # Extract key food words from the ingredient
-        food_words = ['pecans', 'pecan', 'parsley', 'sage', 'herbs', 'nuts', 'cheese', 
-                     'flour', 'oil', 'butter', 'onion', 'garlic', 'milk', 'cream',
-                     'mushrooms', 'mushroom', 'chicken', 'beef', 'pork', 'fish']
+        ingredient_foods = {word for word in _FOOD_WORDS if word in ingredient_lower}
+        if not ingredient_foods:
+            return ingredient
         
-        ingredient_foods = [word for word in food_words if word in ingredient_lower]
-        
-        for note in substitution_notes:
-            note_lower = note.lower()
-            
+        for note, note_foods in note_food_sets:
             # Check if this substitution note mentions any of the foods in this ingredient
-            if any(food in note_lower for food in ingredient_foods):
+            if ingredient_foods & note_foods:
                 # Clean up the substitution note
                 clean_note = note.strip()
                 # Remove redundant prefixes
-                clean_note = re.sub(r'^(you can |can |try )', '', clean_note, flags=re.IGNORECASE)
+                clean_note = _SUBSTITUTION_PREFIX_RE.sub('', clean_note)
                 
                 # Append to ingredient in parentheses
                 return f"{ingredient} ({clean_note})"
@@ -2544,70 +2951,33 @@ class EvernoteToNextcloudConverter:
 
     def looks_like_instruction(self, line: str) -> bool:
         """Check if a line looks like a cooking instruction (more strict than is_instruction_line)"""
-        line_lower = line.lower()
-        
-        # Exclude serving/yield info first
-        if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line_lower):
-            return False
-        
-        # Exclude time information (but not cooking instructions that mention time)
-        # Only reject standalone time references like "Prep time: 15 minutes" or "Cook time: 30 min"
-        if re.search(r'\b(prep|cook|total)\s+time\b', line_lower):
-            return False
-        
-        # Must be longer than typical ingredients
-        if len(line) < 20:
-            return False
-        
-        instruction_keywords = [
-            'cook', 'bake', 'mix', 'add', 'heat', 'stir', 'pour', 'place', 
-            'remove', 'serve', 'prepare', 'combine', 'season', 'boil', 
-            'simmer', 'fry', 'chop', 'slice', 'dice', 'mince', 'whisk',
-            'blend', 'fold', 'beat', 'knead', 'roll', 'spread', 'brush',
-            'drizzle', 'sprinkle', 'garnish', 'chill', 'freeze', 'thaw',
-            'create','preheat', 'until', 'then', 'next', 'meanwhile'
-        ]
-        
-        # Use word boundaries to match complete words only
-        has_instruction_keyword = any(re.search(r'\b' + re.escape(keyword) + r'\b', line_lower) for keyword in instruction_keywords)
-        
-        return has_instruction_keyword
+        return _looks_like_instruction(line)
 
     def extract_instructions(self, content: str, recipe_title: str = "Unknown Recipe") -> List[str]:
         """Extract cooking instructions with inline images"""
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        debug = self.debug
+        lines = [line for line in map(str.strip, content.split('\n')) if line]
+        lines_lower = [line.lower() for line in lines]
         instructions = []
         
-        if self.debug:
+        if debug:
             print(f"\n{'*'*80}")
             print(f"* INSTRUCTION EXTRACTION - {recipe_title}")
             print(f"{'*'*80}")
             print(f"Total lines to process: {len(lines)}")
         
         # Get all substitution notes to exclude them from instructions
-        substitution_notes = []
-        for line in lines:
-            if self.is_substitution_note(line):
-                substitution_notes.append(line.lower())
+        substitution_notes = [line_lower for line, line_lower in zip(lines, lines_lower)
+                              if self.is_substitution_note(line, line_lower)]
         
         # Look for instruction patterns and include image placeholders
-        for line in lines:
-            # Skip URLs completely
-            if any(url_part in line.lower() for url_part in ['http', 'www.', '.com', '.org']):
-                if self.debug:
-                    print(f"    DEBUG: SKIPPED - contains URL")
-                continue
-                
-            # Skip page numbers and references
-            if re.search(r'\bpage\s+\d+\b|\bp\.\s*\d+\b', line.lower()):
-                if self.debug:
-                    print(f"    DEBUG: SKIPPED - contains page reference")
-                continue
-                
-            # Skip ONLY standalone time information like "Prep time: 15 minutes" but NOT cooking instructions with time
-            if re.search(r'\b(prep|cook|total)\s+time\b', line.lower()):
-                if self.debug:
-                    print(f"    DEBUG: SKIPPED - contains standalone time info")
+        for line, line_lower in zip(lines, lines_lower):
+            # Skip URLs, page references and ONLY standalone time information like
+            # "Prep time: 15 minutes" but NOT cooking instructions with time
+            skip_match = _INSTRUCTION_SKIP_RE.search(line_lower)
+            if skip_match:
+                if debug:
+                    print(f"    DEBUG: SKIPPED - {_INSTRUCTION_SKIP_REASONS[skip_match.lastgroup]}")
                 continue
                 
             # ALLOW yield/serving info in instructions (keep it as useful recipe metadata)
@@ -2616,36 +2986,40 @@ class EvernoteToNextcloudConverter:
             #     continue
             
             # Skip substitution notes that are already in ingredients
-            if any(note in line.lower() for note in substitution_notes):
-                if self.debug:
+            if any(note in line_lower for note in substitution_notes):
+                if debug:
                     print(f"    DEBUG: SKIPPED - substitution note")
                 continue
             
             # Check if this is an image placeholder
-            if re.match(r'\[IMAGE_\d+\]', line):
+            if _is_image_placeholder(line):
                 instructions.append(line)  # Keep image placeholders as separate instructions
-                if self.debug:
+                if debug:
                     print(f"    DEBUG: ADDED as IMAGE placeholder")
-            elif (self.is_instruction_line(line) and 
-                  len(line) > 15 and 
-                  not self.is_ingredient_line(line)):  # Make sure it's not also an ingredient
+            elif (len(line) > 15 and 
+                  self.is_instruction_line(line, line_lower) and 
+                  not _is_ingredient_line(line)):  # Make sure it's not also an ingredient
                 clean_line = self.clean_instruction_line(line)
                 if clean_line:
                     instructions.append(clean_line)
-                    if self.debug:
+                    if debug:
                         print(f"    DEBUG: ADDED as INSTRUCTION: '{clean_line[:50]}...'")
                 else:
-                    if self.debug:
+                    if debug:
                         print(f"    DEBUG: REJECTED - clean_instruction_line returned empty/None")
             else:
-                if self.debug:
-                    is_instruction = self.is_instruction_line(line)
-                    is_ingredient = self.is_ingredient_line(line)
+                if debug:
+                    is_instruction = self.is_instruction_line(line, line_lower)
+                    is_ingredient = _is_ingredient_line(line)
                     print(f"    DEBUG: REJECTED instruction - is_instruction={is_instruction}, is_ingredient={is_ingredient}, len={len(line)}")
                     if is_instruction and is_ingredient:
                         print(f"    DEBUG: Line classified as BOTH instruction and ingredient - rejecting as instruction")
+            
+            # Stop once the limit is reached; later lines would be sliced off anyway
+            if len(instructions) >= 30:
+                break
         
-        if self.debug:
+        if debug:
             print(f"=== FINAL INSTRUCTION COUNT: {len(instructions)} ===")
             for i, inst in enumerate(instructions):
                 print(f"  {i+1}. {inst[:100]}...")
@@ -2655,23 +3029,20 @@ class EvernoteToNextcloudConverter:
         
         # Fallback: use longer lines that aren't ingredients
         if not instructions:
-            for line in lines:
+            for line, line_lower in zip(lines, lines_lower):
                 # Apply same filters
-                if any(url_part in line.lower() for url_part in ['http', 'www.', '.com', '.org']):
-                    continue
-                if re.search(r'\bpage\s+\d+\b|\bp\.\s*\d+\b', line.lower()):
-                    continue
-                if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line.lower()):
-                    continue
-                if re.search(r'\b(prep|cook|total)\s+time\b|\b\d+\s+(min|minutes|hrs?|hours?)\b', line.lower()):
+                if self._line_skip_reason(line_lower):
                     continue
                     
-                if re.match(r'\[IMAGE_\d+\]', line):
+                if _is_image_placeholder(line):
                     instructions.append(line)
                 elif (len(line) > 25 and 
-                      not self.is_ingredient_line(line) and
+                      not _is_ingredient_line(line) and
                       len(line) < 500):
                     instructions.append(line)
+                
+                if len(instructions) >= 30:
+                    break
         
         # Ensure at least one instruction
         if not instructions:
@@ -2681,62 +3052,67 @@ class EvernoteToNextcloudConverter:
 
     def clean_instruction_line(self, line: str) -> str:
         """Clean up an instruction line"""
-        # Remove bullet points and checkmarks
-        line = re.sub(r'^[•\-\*☐✓]\s*', '', line)
+        # Remove bullet points and checkmarks (the first character decides whether the regex can match)
+        if line and line[0] in '•-*☐✓':
+            line = _INSTRUCTION_BULLET_RE.sub('', line)
         # Remove leading numbers with periods/parentheses
-        line = re.sub(r'^\d+[\.\)]\s*', '', line)
+        if line and line[0].isdigit():
+            line = _NUM_PREFIX_RE.sub('', line)
         
         return line.strip()
 
-    def is_instruction_line(self, line: str) -> bool:
+    def is_instruction_line(self, line: str, line_lower: Optional[str] = None) -> bool:
         """Check if line looks like an instruction"""
-        line_lower = line.lower()
+        # Must be longer than typical ingredients (checked first so short lines skip the regex work)
+        if len(line) < 20:
+            return False
+        
+        if line_lower is None:
+            line_lower = line.lower()
         
-        # Exclude serving/yield info first
-        if re.search(r'\b(serves?|servings?|yield|makes?)\s+\d+\b', line_lower):
+        # Exclude serving/yield info
+        if _prefiltered_search(_SERVING_INFO_RE, _SERVING_INFO_LITERALS, line_lower):
             return False
         
         # Exclude time information (but not cooking instructions that mention time)
         # Only reject standalone time references like "Prep time: 15 minutes" or "Cook time: 30 min"
-        if re.search(r'\b(prep|cook|total)\s+time\b', line_lower):
-            return False
-        
-        # Must be longer than typical ingredients
-        if len(line) < 20:
+        if _prefiltered_search(_TIME_LABEL_RE, _TIME_LABEL_LITERALS, line_lower):
             return False
         
-        instruction_keywords = [
-            'cook', 'bake', 'mix', 'add', 'heat', 'stir', 'pour', 'place', 
-            'remove', 'serve', 'prepare', 'combine', 'season', 'boil', 
-            'simmer', 'fry', 'chop', 'slice', 'dice', 'mince', 'whisk',
-            'blend', 'fold', 'beat', 'knead', 'roll', 'spread', 'brush',
-            'drizzle', 'sprinkle', 'garnish', 'chill', 'freeze', 'thaw',
-            'create','preheat', 'until', 'then', 'next', 'meanwhile'
-        ]
-        
         # Use word boundaries to match complete words only
-        has_instruction_keyword = any(re.search(r'\b' + re.escape(keyword) + r'\b', line_lower) for keyword in instruction_keywords)
+        has_instruction_keyword = bool(_INSTRUCTION_KW_RE.search(line_lower))
         
         return has_instruction_keyword
 
     def extract_description(self, content: str) -> str:
         """Extract recipe description"""
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        # Only the first five non-empty lines are considered, so read them lazily
+        lines = itertools.islice(filter(None, map(str.strip, io.StringIO(content))), 5)
         
         # Look for descriptive lines at the beginning
         description_lines = []
-        for line in lines[:5]:
+        description_length = 0
+        truncated = False
+        for line in lines:
+            line_lower = line.lower()
             if (len(line) > 20 and 
-                not self.is_ingredient_line(line) and
-                not self.is_instruction_line(line) and
-                not re.search(r'\b(ingredient|instruction|direction|method|step)\b', line.lower())):
+                not _is_ingredient_line(line) and
+                not self.is_instruction_line(line, line_lower) and
+                not _prefiltered_search(_SECTION_WORD_RE, _SECTION_WORD_LITERALS, line_lower)):
+                # Limit length while collecting so an oversize line is never joined in full
+                separator = 1 if description_lines else 0
+                room = 500 - description_length - separator
+                if len(line) > room:
+                    if room >= 0:
+                        description_lines.append(line[:room])
+                    truncated = True
+                    break
                 description_lines.append(line)
+                description_length += separator + len(line)
         
         description = ' '.join(description_lines)
-        
-        # Limit length and clean up
-        if len(description) > 500:
-            description = description[:500] + "..."
+        if truncated:
+            description += "..."
         
         return description or "Recipe imported from Evernote"
 
@@ -2748,7 +3124,13 @@ class EvernoteToNextcloudConverter:
         try:
             # Evernote format: 20231201T123000Z
             if 'T' in date_str and len(date_str) >= 15:
-                dt = datetime.strptime(date_str[:15], '%Y%m%dT%H%M%S')
+                # Fixed-width fast path; strptime handles anything irregular
+                digits = date_str[:8] + date_str[9:15]
+                if date_str[8] == 'T' and digits.isascii() and digits.isdigit():
+                    dt = datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+                                  int(digits[8:10]), int(digits[10:12]), int(digits[12:14]))
+                else:
+                    dt = datetime.strptime(date_str[:15], '%Y%m%dT%H%M%S')
                 return dt.isoformat()
         except ValueError:
             pass
@@ -2757,7 +3139,8 @@ class EvernoteToNextcloudConverter:
 
     def post_process_ingredients_from_instructions(self, ingredients: List[str], instructions: List[str], recipe_title: str = "Unknown Recipe") -> tuple[List[str], List[str]]:
         """Post-process instructions to find misclassified ingredients and move them back"""
-        if self.debug:
+        debug = self.debug
+        if debug:
             print(f"\n{'~'*80}")
             print(f"~ POST-PROCESSING INGREDIENTS FROM INSTRUCTIONS - {recipe_title}")
             print(f"{'~'*80}")
@@ -2768,63 +3151,37 @@ class EvernoteToNextcloudConverter:
         
         for i, instruction in enumerate(instructions):
             # Skip image placeholders
-            if re.match(r'\[IMAGE_\d+\]', instruction):
+            if _is_image_placeholder(instruction):
                 new_instructions.append(instruction)
                 continue
             
             instruction_lower = instruction.lower()
             
-            # Check for patterns that indicate this is actually ingredient information
-            ingredient_indicators = [
-                # Very specific pattern for the exact line we want to catch
-                r'optional\s+additional\s+seasonings?\s+to\s+taste.*i\s+usually\s+add',
-                # More flexible pattern for optional seasonings
-                r'^optional\s+additional\s+seasonings?\s+to\s+taste',
-                # Standalone "to taste" without cooking verbs
-                r'^\s*to\s+taste\s*[-:]?\s*(salt|pepper|seasoning)',
-                # Simple ingredient lists starting with "optional"
-                r'^optional\s*[-:]?\s*[a-z\s,&]+\s+to\s+taste\s*$',
-            ]
-            
-            is_likely_ingredient = False
-            matched_pattern = None
-            
             # Safety check: Don't move lines that contain cooking verbs (actual instructions)
-            cooking_verbs = [
-                'make', 'melt', 'mix', 'stir', 'cook', 'heat', 'drain', 'transfer', 
-                'add in', 'dump', 'brown', 'mixing in', 'stirring', 'top with',
-                'melting', 'breadcrumb', 'topping', 'constantly', 'drain and',
-                'noodles', 'transfer to', 'plate'
-            ]
+            # Only check the ingredient indicators if no cooking verbs are present
+            indicator_match = None
+            if not _COOKING_VERBS_RE.search(instruction_lower):
+                indicator_match = _INGREDIENT_INDICATOR_RE.search(instruction_lower)
             
-            has_cooking_verbs = any(verb in instruction_lower for verb in cooking_verbs)
-            
-            if not has_cooking_verbs:  # Only consider if no cooking verbs present
-                for j, pattern in enumerate(ingredient_indicators):
-                    if re.search(pattern, instruction_lower):
-                        is_likely_ingredient = True
-                        matched_pattern = pattern
-                        break
-            
-            if is_likely_ingredient:
-                if self.debug:
+            if indicator_match:
+                if debug:
                     print(f"  MOVING TO INGREDIENTS: '{instruction[:80]}...'")
-                    print(f"    Matched pattern: {matched_pattern}")
+                    print(f"    Matched pattern: {_INGREDIENT_INDICATORS[indicator_match.lastindex - 1]}")
                 
                 # Clean up the instruction to make it more ingredient-like
                 clean_ingredient = instruction
                 
                 # Tidy up dashes and spacing
-                clean_ingredient = re.sub(r'\s+', ' ', clean_ingredient).strip()
+                clean_ingredient = _WS_RE.sub(' ', clean_ingredient).strip()
                 
                 new_ingredients.append(clean_ingredient)
                 moved_count += 1
-                if self.debug:
+                if debug:
                     print(f"    CLEANED TO: '{clean_ingredient}'")
             else:
                 new_instructions.append(instruction)
         
-        if self.debug:
+        if debug:
             print(f"  MOVED {moved_count} items from instructions to ingredients")
             print(f"~ END POST-PROCESSING - {recipe_title}")
             print(f"{'~'*80}")
@@ -2834,31 +3191,31 @@ class EvernoteToNextcloudConverter:
     def extract_structured_recipe_data(self, html_content: str) -> Optional[dict]:
         """Extract JSON-LD Recipe data from HTML and return as dict, or None if not found."""
         # Try standard JSON-LD patterns
-        json_ld_patterns = [
-            r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-            r'<script[^>]*type=["\']application/ld\+json["\']>(.*?)</script>',
-        ]
-        
-        for i, pattern in enumerate(json_ld_patterns):
-            matches = re.findall(pattern, html_content, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                clean_json = match.strip()  # Initialize here to avoid unbound variable issues
+        for match in _json_ld_blocks(html_content):
+            clean_json = match.strip()  # Initialize here to avoid unbound variable issues
+            try:
+                if self.debug:
+                    print(f"    Found JSON-LD block: {match[:200]}...")
+                
+                # Most blocks are valid JSON as published, only clean up the ones that are not
                 try:
-                    if self.debug:
-                        print(f"    Found JSON-LD block: {match[:200]}...")
-                    
+                    json_data = json.loads(clean_json)
+                except json.JSONDecodeError:
+                    json_data = None
+                
+                if json_data is None:
                     # Clean up the JSON
                     # Remove HTML comments
-                    clean_json = re.sub(r'<!--.*?-->', '', clean_json, flags=re.DOTALL)
+                    clean_json = _HTML_COMMENT_RE.sub('', clean_json)
                     
                     # Remove JavaScript comments
-                    clean_json = re.sub(r'//.*?\n', '', clean_json)
-                    clean_json = re.sub(r'/\*.*?\*/', '', clean_json, flags=re.DOTALL)
+                    clean_json = _JS_LINE_COMMENT_RE.sub('', clean_json)
+                    clean_json = _JS_BLOCK_COMMENT_RE.sub('', clean_json)
                     
                     # Fix common JSON formatting issues
-                    clean_json = re.sub(r'\n\s*,', ',', clean_json)
-                    clean_json = re.sub(r',(\s*[}\]])', r'\1', clean_json)
-                    clean_json = re.sub(r'([}\]"])\s*\n\s*"', r'\1,\n"', clean_json)
+                    clean_json = _JSON_LEADING_COMMA_RE.sub(',', clean_json)
+                    clean_json = _JSON_TRAILING_COMMA_RE.sub(r'\1', clean_json)
+                    clean_json = _JSON_MISSING_COMMA_RE.sub(r'\1,\n"', clean_json)
                     
                     clean_json = clean_json.strip()
                     
@@ -2868,31 +3225,32 @@ class EvernoteToNextcloudConverter:
                     # Try to parse the JSON
                     if clean_json.startswith('[') or clean_json.startswith('{'):
                         json_data = json.loads(clean_json)
-                        
-                        # Handle both dict and list
-                        items = json_data if isinstance(json_data, list) else [json_data]
-                        
-                        for item in items:
-                            recipe = self._extract_recipe_from_json_item(item)
-                            if recipe:
-                                if self.debug:
-                                    print(f"    Successfully found Recipe in JSON-LD!")
-                                return recipe
+                
+                if isinstance(json_data, (dict, list)):
+                    # Handle both dict and list
+                    items = json_data if isinstance(json_data, list) else [json_data]
                     
-                except json.JSONDecodeError as e:
-                    if self.debug:
-                        print(f"    JSON parsing failed: {e}")
-                        # Show the problematic line for debugging
-                        if 'clean_json' in locals():
-                            lines = clean_json.split('\n')
-                            error_line = min(e.lineno, len(lines)) if hasattr(e, 'lineno') and e.lineno else 1
-                            print(f"    Error around line {error_line}: {lines[error_line-1] if error_line <= len(lines) else 'N/A'}")
-                    continue
-                except Exception as e:
-                    if self.debug:
-                        print(f"    General error parsing JSON-LD: {e}")
-                    continue
-        
+                    for item in items:
+                        recipe = self._extract_recipe_from_json_item(item)
+                        if recipe:
+                            if self.debug:
+                                print(f"    Successfully found Recipe in JSON-LD!")
+                            return recipe
+                
+            except json.JSONDecodeError as e:
+                if self.debug:
+                    print(f"    JSON parsing failed: {e}")
+                    # Show the problematic line for debugging
+                    if 'clean_json' in locals():
+                        lines = clean_json.split('\n')
+                        error_line = min(e.lineno, len(lines)) if hasattr(e, 'lineno') and e.lineno else 1
+                        print(f"    Error around line {error_line}: {lines[error_line-1] if error_line <= len(lines) else 'N/A'}")
+                continue
+            except Exception as e:
+                if self.debug:
+                    print(f"    General error parsing JSON-LD: {e}")
+                continue
+    
         if self.debug:
             print(f"    No valid JSON-LD Recipe found")
         return None
@@ -2902,24 +3260,15 @@ class EvernoteToNextcloudConverter:
         if not isinstance(item, dict):
             return None
             
-        # Check direct @type
-        if item.get('@type') == 'Recipe':
-            return item
-        
-        # Check if @type is a list containing 'Recipe'
-        item_type = item.get('@type')
-        if isinstance(item_type, list) and 'Recipe' in item_type:
+        if _is_recipe_node(item):
             return item
         
         # Check @graph property (common in some implementations)
-        if '@graph' in item:
-            graph_items = item['@graph']
-            if isinstance(graph_items, list):
-                for graph_item in graph_items:
-                    if isinstance(graph_item, dict):
-                        graph_type = graph_item.get('@type')
-                        if graph_type == 'Recipe' or (isinstance(graph_type, list) and 'Recipe' in graph_type):
-                            return graph_item
+        graph_items = item.get('@graph')
+        if isinstance(graph_items, list):
+            for graph_item in graph_items:
+                if isinstance(graph_item, dict) and _is_recipe_node(graph_item):
+                    return graph_item
         
         return None
 
@@ -2948,35 +3297,7 @@ class EvernoteToNextcloudConverter:
             recipe["@type"] = "Recipe"
             
             # Apply tag logic to JSON-LD recipes
-            base_keywords = ["imported", "evernote"]
-            existing_keywords = []
-            
-            # Parse existing keywords if they exist
-            if recipe.get('keywords'):
-                if isinstance(recipe['keywords'], str):
-                    existing_keywords = [k.strip() for k in recipe['keywords'].split(',') if k.strip()]
-                elif isinstance(recipe['keywords'], list):
-                    existing_keywords = [str(k).strip() for k in recipe['keywords'] if str(k).strip()]
-            
-            # Apply tag logic
-            if self.override_tags:
-                # Override completely with new tags
-                final_keywords = self.override_tags
-            else:
-                # Start with base keywords, add existing, then additional
-                final_keywords = base_keywords.copy()
-                # Add existing keywords that aren't already in base
-                for keyword in existing_keywords:
-                    if keyword not in final_keywords:
-                        final_keywords.append(keyword)
-                # Add additional tags
-                if self.additional_tags:
-                    for tag in self.additional_tags:
-                        if tag not in final_keywords:
-                            final_keywords.append(tag)
-            
-            # Update keywords in recipe
-            recipe['keywords'] = ', '.join(final_keywords)
+            recipe['keywords'] = self.merge_keywords(recipe.get('keywords'))
             
             # Apply category logic to JSON-LD recipes
             existing_categories = []
@@ -3030,7 +3351,7 @@ class EvernoteToNextcloudConverter:
                 print(f"    Error validating JSON-LD recipe: {e}")
             return None
 
-    def download_and_update_json_ld_images(self, recipe_data: Dict, recipe_dir: Path) -> Dict:
+    def download_and_update_json_ld_images(self, recipe_data: Dict, recipe_files: Dict[str, bytes]) -> Dict:
         """Download images from JSON-LD URLs and update paths to relative local paths"""
         try:
             if not recipe_data.get('image'):
@@ -3119,13 +3440,15 @@ class EvernoteToNextcloudConverter:
                     headers = {
                         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                         'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                        'Accept-Encoding': 'gzip, deflate, br',
+                        'Accept-Encoding': _BROWSER_ACCEPT_ENCODING,
                         'Referer': recipe_data.get('url', ''),
                         'Sec-Fetch-Dest': 'image',
                         'Sec-Fetch-Mode': 'no-cors',
                         'Sec-Fetch-Site': 'same-origin',
                     }
-                    response = requests.get(img_url, timeout=20, stream=True, headers=headers)
+                    # Images usually come from the recipe host that was just fetched, so they share its rate limit
+                    self.wait_for_host(urlparse(img_url).netloc.lower())
+                    response = self.session.get(img_url, timeout=20, stream=True, headers=headers)
                     response.raise_for_status()
                     
                     # Check content length to avoid downloading huge files but allow larger images
@@ -3158,26 +3481,20 @@ class EvernoteToNextcloudConverter:
                         image_filename = f"full{ext}"
                     else:
                         image_filename = f"image_{i+1}{ext}"
-                    image_path = recipe_dir / image_filename
                     
-                    # Download and save the image
-                    with open(image_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:  # Filter out keep-alive chunks
-                                f.write(chunk)
+                    # Download the image
+                    image_bytes = b''.join(response.iter_content(chunk_size=8192))
                     
                     # Verify the image was downloaded properly
-                    if image_path.exists() and image_path.stat().st_size > 0:
+                    if image_bytes:
+                        recipe_files[image_filename] = image_bytes
                         downloaded_images.append(image_filename)
                         
                         if self.debug:
-                            print(f"    Saved image as: {image_filename} ({image_path.stat().st_size} bytes)")
+                            print(f"    Saved image as: {image_filename} ({len(image_bytes)} bytes)")
                     else:
                         if self.debug:
                             print(f"    Failed to save image properly: {image_filename}")
-                        # Clean up empty file
-                        if image_path.exists():
-                            image_path.unlink()
                         
                 except Exception as e:
                     if self.debug:
@@ -3212,18 +3529,11 @@ class EvernoteToNextcloudConverter:
         
         # WordPress sites often have size suffixes we can remove
         # Pattern: image-300x200.jpg -> image.jpg
-        url = re.sub(r'-\d+x\d+(\.[a-zA-Z]+)$', r'\1', url)
+        url = _IMAGE_DIMENSIONS_SUFFIX_RE.sub(r'\1', url)
         
         # Remove common thumbnail/small size indicators
-        size_indicators = [
-            '-thumb', '-thumbnail', '-small', '-medium', '-preview',
-            '-150x150', '-300x300', '-400x400', '-150', '-300', '-400',
-            '_thumb', '_thumbnail', '_small', '_medium', '_preview',
-            '_150x150', '_300x300', '_400x400', '_150', '_300', '_400'
-        ]
-        
-        for indicator in size_indicators:
-            url = re.sub(rf'{re.escape(indicator)}(\.[a-zA-Z]+)$', r'\1', url)
+        for indicator in _IMAGE_SIZE_INDICATOR_RES:
+            url = indicator.sub(r'\1', url)
         
         # For many WordPress sites, try removing ?resize= parameters
         if '?resize=' in url:
@@ -3252,20 +3562,20 @@ class EvernoteToNextcloudConverter:
         # Cloudinary
         if 'cloudinary.com' in url:
             # Try to replace small sizes with larger ones
-            url = re.sub(r'/w_\d+,h_\d+/', '/w_1200,h_800/', url)
-            url = re.sub(r'/c_scale,w_\d+/', '/c_scale,w_1200/', url)
+            url = _CLOUDINARY_SIZE_RE.sub('/w_1200,h_800/', url)
+            url = _CLOUDINARY_SCALE_RE.sub('/c_scale,w_1200/', url)
         
         # Squarespace
         if 'squarespace-cdn.com' in url or 'static1.squarespace.com' in url:
             # Remove format parameters that might reduce quality
-            url = re.sub(r'\?format=\d+w', '?format=2500w', url)
+            url = _SQUARESPACE_FORMAT_RE.sub('?format=2500w', url)
         
         if self.debug and url != original_url:
             print(f"    Enhanced image URL: {original_url} -> {url}")
         
         return url
 
-    def create_recipe_from_json_ld(self, recipe_data: Dict, title: str, note: ET.Element) -> Optional[Path]:
+    def create_recipe_from_json_ld(self, recipe_data: Dict, title: str, note: ET.Element) -> Optional[str]:
         """Create recipe directory directly from JSON-LD data without text parsing"""
         try:
             if self.debug:
@@ -3273,20 +3583,16 @@ class EvernoteToNextcloudConverter:
             
             # Create recipe directory
             self.recipe_counter += 1
-            safe_title = re.sub(r'[^\w\s-]', '', title).strip()
-            safe_title = re.sub(r'[\s]+', '_', safe_title)
-            recipe_dir_name = f"{safe_title}_{self.recipe_counter}"
+            recipe_dir_name = f"{_safe_title(title)}_{self.recipe_counter}"
             
-            recipe_dir = self.temp_dir / recipe_dir_name
-            recipe_dir.mkdir(exist_ok=True)
+            recipe_files: Dict[str, bytes] = {}
             
             # Handle images if they exist in the JSON-LD (download from URLs)
-            recipe_data = self.download_and_update_json_ld_images(recipe_data, recipe_dir)
+            recipe_data = self.download_and_update_json_ld_images(recipe_data, recipe_files)
             
             # Create recipe.json file
-            json_file = recipe_dir / "recipe.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(recipe_data, f, indent=2, ensure_ascii=False)
+            recipe_files["recipe.json"] = json.dumps(recipe_data, indent=2, ensure_ascii=False).encode('utf-8')
+            self.write_recipe_files(recipe_dir_name, recipe_files)
             
             if self.debug:
                 ingredients_count = len(recipe_data.get('recipeIngredient', []))
@@ -3295,13 +3601,28 @@ class EvernoteToNextcloudConverter:
             
             print(f"  Recipe {self.recipe_counter}: {title} (JSON-LD from {recipe_data.get('url', 'web')})")
             print(f"    ✓ Processing method: JSON-LD (structured data from web)")
-            return recipe_dir
+            return recipe_dir_name
             
         except Exception as e:
             if self.debug:
                 print(f"    Error creating recipe from JSON-LD: {e}")
             return None
 
+# Converter used by prepare_recipe calls in extraction worker processes
+_worker_converter: Optional[EvernoteToNextcloudConverter] = None
+
+
+def _init_extraction_worker(converter: EvernoteToNextcloudConverter):
+    """Keep the converter sent to an extraction worker process for all of its tasks"""
+    global _worker_converter
+    _worker_converter = converter
+
+
+def _prepare_recipe_in_worker(note: ET.Element, source_url: str, web_content: Optional[str]) -> Optional[Dict]:
+    """Extract a recipe in an extraction worker process"""
+    return _worker_converter.prepare_recipe(note, source_url, web_content)
+
+
 def test_url_fetch(url: str, debug: bool = True):
     """Test URL fetching functionality"""
     print(f"Testing URL fetch for: {url}")
@@ -3314,10 +3635,11 @@ def test_url_fetch(url: str, debug: bool = True):
         direct_response = requests.get(url, timeout=10, allow_redirects=True)
         print(f"Direct requests - Status: {direct_response.status_code}")
         print(f"Direct requests - Final URL: {direct_response.url}")
-        print(f"Direct requests - Content length: {len(direct_response.text)}")
+        direct_text = direct_response.text
+        print(f"Direct requests - Content length: {len(direct_text)}")
         print(f"Direct requests - Headers: {dict(list(direct_response.headers.items())[:5])}")
         if direct_response.status_code == 200:
-            print(f"Direct requests - Content preview: {direct_response.text[:200]}...")
+            print(f"Direct requests - Content preview: {direct_text[:200]}...")
     except Exception as e:
         print(f"Direct requests failed: {e}")
     
@@ -3354,7 +3676,7 @@ def main():
     parser = argparse.ArgumentParser(
         description='\nConvert Evernote .enex files to Nextcloud Recipes format\n',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        usage='\n%(prog)s [-h|--help] [--tags TAG1,TAG2,...] [--tags-override TAG1,TAG2,...] [--categories CAT1,CAT2,...] [--categories-override CAT1,CAT2,...] [--debug] [--no-web-fetch] [--test-url URL] input [output]',
+        usage='\n%(prog)s [-h|--help] [--tags TAG1,TAG2,...] [--tags-override TAG1,TAG2,...] [--categories CAT1,CAT2,...] [--categories-override CAT1,CAT2,...] [--debug] [--no-web-fetch] [--no-cache] [--jobs N] [--test-url URL] input [output]',
         epilog="""
 Examples:
   %(prog)s recipes.enex                                    Convert single file
@@ -3405,6 +3727,12 @@ Notes:
     process_group.add_argument('--no-web-fetch', 
                               action='store_true', 
                               help='Disable web content fetching (use only Evernote content)')
+    process_group.add_argument('--no-cache', 
+                              action='store_true', 
+                              help='Always download web pages instead of reusing ones cached by earlier runs')
+    process_group.add_argument('-j', '--jobs', 
+                              type=int, metavar='N', 
+                              help='Number of worker processes for recipe extraction (default: number of CPUs)')
     
     # Testing options
     test_group = parser.add_argument_group('Testing Options')
@@ -3476,13 +3804,17 @@ Notes:
         additional_tags=additional_tags,
         override_tags=override_tags,
         additional_categories=additional_categories,
-        override_categories=override_categories
+        override_categories=override_categories,
+        jobs=args.jobs
     )
     
     if args.no_web_fetch:
         converter.enable_web_fetch = False
         print("Web content fetching disabled")
     
+    if args.no_cache:
+        converter.cache_dir = None
+    
     converter.convert()
 
 if __name__ == "__main__":